@@ -4,9 +4,14 @@ from __future__ import annotations
 import asyncio
 import re
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 
-from playwright.sync_api import sync_playwright
+from ...config import EVENTS_PAGE_TIMEOUT_MS, EVENTS_STATIC_FIRST
+from ...dates import day_month, iso_date
+from ...metrics import timed
+from ...models import Event
+from .aca import fetch_aca_country, split_city_country
+from .browser_pool import BrowserPool, get_browser_pool
 
 
 ACA_SOURCES = [
@@ -16,11 +21,6 @@ ACA_SOURCES = [
     ("Philippines","https://www.allconferencealert.com/philippines/energy-conference.html"),
 ]
 
-MONTHS = {
-    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
-    "JUL": 7, "AUG": 8, "SEP": 9, "SEPT": 9, "OCT": 10, "NOV": 11, "DEC": 12,
-}
-
 def _infer_year_from_header(title_text: str) -> Optional[int]:
     """
     Header usually looks like:
@@ -38,115 +38,128 @@ def _parse_day_mon(day_mon: str, fallback_year: Optional[int]) -> Optional[str]:
     """
     Accepts '02 Nov' or '2 Nov'. Returns ISO date string 'YYYY-MM-DD' using fallback_year.
     """
-    if not day_mon:
-        return None
-    s = day_mon.strip().upper().replace(".", "")
-    m = re.match(r"(?P<d>\d{1,2})\s+(?P<mon>[A-Z]{3,4})", s)
-    if not m:
-        return None
-    d = int(m.group("d"))
-    mon = MONTHS.get(m.group("mon"))
-    if not mon:
-        return None
-    y = fallback_year or datetime.now().year
-    try:
-        return datetime(y, mon, d).date().isoformat()
-    except ValueError:
+    dm = day_month(day_mon) if day_mon else None
+    if not dm:
         return None
+    d, mon = dm
+    return iso_date(fallback_year or datetime.now().year, mon, d)
 
 def _clean_text(s: Optional[str]) -> str:
     return re.sub(r"\s+", " ", (s or "")).strip()
 
-def fetch_allconferencealert_events() -> List[Dict]:
+# One round-trip per page: heading + every row's cells come back as JSON
+_EXTRACT_JS = """
+() => {
+  const h = document.querySelector("h1,h2,h3");
+  const rows = [];
+  for (const tr of document.querySelectorAll("table tbody tr")) {
+    const tds = tr.querySelectorAll("td");
+    if (tds.length < 3) continue;
+    const el = tds[1].querySelector("a") || tds[1];
+    rows.push([tds[0].innerText, el.innerText, el.getAttribute("href"), tds[2].innerText]);
+  }
+  return {heading: h ? h.innerText : "", rows: rows};
+}
+"""
+
+def _rows_to_events(data: Dict, country_name: str, url: str) -> List[Event]:
+    fallback_year = _infer_year_from_header(data.get("heading") or "")
+    out: List[Event] = []
+    for date_raw, title_raw, href, venue_raw in data.get("rows") or []:
+        date_text = _clean_text(date_raw)                    # e.g., "02 Nov"
+        title_text = _clean_text(title_raw)
+        if href and href.startswith("/"):
+            # Convert relative to absolute
+            href = url.rstrip("/") + href
+
+        venue_text = _clean_text(venue_raw)                  # e.g., "Singapore, Singapore"
+
+        # Split venue → city, country (same normalizer as the static scraper)
+        loc = split_city_country(venue_text)
+        city, region = loc["city"], loc["region"]
+
+        starts_on = _parse_day_mon(date_text, fallback_year)
+
+        if title_text and starts_on:
+            out.append(Event(
+                title=title_text,
+                starts_on=starts_on,
+                region=region or country_name,   # fallback to page country
+                city=city,
+                link=href or url,
+            ))
+    return out
+
+async def _scrape_source(pool: BrowserPool, country_name: str, url: str) -> List[Event]:
+    async with pool.page() as page:
+        print(f"[ACA] GET {url}")
+        await page.goto(url, wait_until="domcontentloaded", timeout=EVENTS_PAGE_TIMEOUT_MS)
+
+        # Wait for table to render. The site shows a spinner first.
+        # We wait for *any* table row to appear.
+        try:
+            await page.wait_for_selector("table tbody tr", timeout=15000)
+            print(f"[ACA] Table detected for {url}")
+        except Exception:
+            # dump the page title to help debug
+            print(f"[ACA] WARNING: no table found for {url} (title={await page.title()!r})")
+            return []
+
+        data = await page.evaluate(_EXTRACT_JS)
+    return _rows_to_events(data, country_name, url)
+
+async def _static_source(country_name: str, url: str) -> List[Event]:
+    try:
+        rows = await asyncio.to_thread(fetch_aca_country, url, country_name)
+    except Exception as e:
+        print(f"[ACA] static fetch failed for {url}: {type(e).__name__}: {e}")
+        return []
+    for r in rows:
+        r.link = r.link or url   # same fallback as the rendered path
+    return rows
+
+@timed("events.scrape")
+async def afetch_allconferencealert_events(sources=None, pool: Optional[BrowserPool] = None,
+                                           static_first: bool = EVENTS_STATIC_FIRST) -> List[Event]:
     """
-    Uses Playwright (Chromium) to render JS and scrape the events table.
+    Scrapes every ACA source concurrently. With `static_first`, the plain HTTP +
+    BeautifulSoup scraper (aca.py) runs first and only sources that yield no
+    rows are rendered in the shared Chromium (see browser_pool).
     Normalized output rows with keys:
       title, region, city, venue, starts_on, ends_on, link, source
     """
-    out: List[Dict] = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/118.0.0.0 Safari/537.36"
-            )
+    sources = list(sources or ACA_SOURCES)
+    per_source: List[List[Event]] = [[] for _ in sources]
+
+    pending = list(range(len(sources)))
+    if static_first:
+        static = await asyncio.gather(*(_static_source(c, u) for c, u in sources))
+        for i, rows in enumerate(static):
+            per_source[i] = rows
+        pending = [i for i, rows in enumerate(static) if not rows]
+        print(f"[ACA] static pass: {len(sources) - len(pending)}/{len(sources)} sources had rows")
+
+    if pending:
+        pool = pool or get_browser_pool()
+        results = await asyncio.gather(
+            *(_scrape_source(pool, *sources[i]) for i in pending),
+            return_exceptions=True,
         )
-
-        for country_name, url in ACA_SOURCES:
-            page = context.new_page()
-            print(f"[ACA] GET {url}")
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-
-            # Wait for table to render. The site shows a spinner first.
-            # We wait for *any* table row to appear.
-            try:
-                page.wait_for_selector("table tbody tr", timeout=15000)
-                print(f"[ACA] Table detected for {url}")
-            except Exception:
-                # dump the page title to help debug
-                print(f"[ACA] WARNING: no table found for {url} (title={page.title()!r})")
+        for i, res in zip(pending, results):
+            if isinstance(res, BaseException):
+                print(f"[ACA] ERROR {sources[i][1]}: {type(res).__name__}: {res}")
                 continue
-
-            # Try to get header text to infer year
-            heading_text = ""
-            try:
-                # Header near the table area
-                heading_el = page.query_selector("h1,h2,h3")
-                heading_text = heading_el.inner_text() if heading_el else ""
-            except Exception:
-                pass
-            fallback_year = _infer_year_from_header(heading_text)
-
-            # Iterate rows
-            rows = page.query_selector_all("table tbody tr")
-            for tr in rows:
-                tds = tr.query_selector_all("td")
-                if len(tds) < 3:
-                    continue
-
-                date_text = _clean_text(tds[0].inner_text())          # e.g., "02 Nov"
-                title_el = tds[1].query_selector("a") or tds[1]
-                title_text = _clean_text(title_el.inner_text())
-                href = title_el.get_attribute("href") if title_el else None
-                if href and href.startswith("/"):
-                    # Convert relative to absolute
-                    href = url.rstrip("/") + href
-
-                venue_text = _clean_text(tds[2].inner_text())         # e.g., "Singapore, Singapore"
-
-                # Split venue → city, country
-                city = None
-                region = None
-                if venue_text:
-                    parts = [p.strip() for p in venue_text.split(",") if p.strip()]
-                    if len(parts) == 1:
-                        # Sometimes the site repeats country only (e.g., "Singapore")
-                        city = parts[0].title()
-                        region = parts[0].title()
-                    else:
-                        city = parts[0].title()
-                        region = parts[-1].title()
-
-                starts_on = _parse_day_mon(date_text, fallback_year)
-
-                if title_text and starts_on:
-                    out.append({
-                        "title": title_text,
-                        "region": region or country_name,   # fallback to page country
-                        "city": city,
-                        "venue": None,
-                        "starts_on": starts_on,
-                        "ends_on": None,
-                        "link": href or url,
-                        "source": "AllConferenceAlert",
-                    })
-
-            page.close()
-
-        context.close()
-        browser.close()
-
-    return out
+            per_source[i] = res
+
+    # keep source order, like the sequential scraper did
+    return [r for rows in per_source for r in rows]
+
+def fetch_allconferencealert_events() -> List[Event]:
+    """Blocking wrapper (CLI / scripts): private browser, closed afterwards."""
+    async def run():
+        pool = BrowserPool()
+        try:
+            return await afetch_allconferencealert_events(pool=pool)
+        finally:
+            await pool.close()
+    return asyncio.run(run())
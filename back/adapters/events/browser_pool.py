@@ -0,0 +1,152 @@
+# back/adapters/events/browser_pool.py
+"""
+Long-lived headless Chromium for the events scrapers.
+
+Launching Chromium costs more than scraping a page, so one browser + context
+is kept for the life of the process (bound to the event loop that started it)
+and scrapers borrow pages from it. A semaphore caps concurrent pages; a
+crashed / disconnected browser is relaunched on the next borrow.
+
+Requests are intercepted at the context level: non-essential resource
+types (images, fonts, CSS, media by default) and third-party hosts are
+aborted, so a page only pulls the HTML and the scripts that render it.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route, async_playwright
+
+from ...config import (
+    EVENTS_BROWSER_PAGES, EVENTS_BLOCK_RESOURCES, EVENTS_BLOCK_THIRD_PARTY, EVENTS_ALLOW_HOSTS,
+)
+
+__all__ = ["BrowserPool", "get_browser_pool", "close_browser_pool"]
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/118.0.0.0 Safari/537.36"
+)
+
+
+def _site(host: str) -> str:
+    # good enough for our sources: 'www.allconferencealert.com' -> 'allconferencealert.com'
+    return ".".join(host.split(".")[-2:])
+
+
+class BrowserPool:
+    def __init__(self, max_pages: int = EVENTS_BROWSER_PAGES,
+                 block_resources: Iterable[str] = EVENTS_BLOCK_RESOURCES,
+                 block_third_party: bool = EVENTS_BLOCK_THIRD_PARTY,
+                 allow_hosts: Iterable[str] = EVENTS_ALLOW_HOSTS):
+        self.max_pages = max(1, max_pages)
+        self.block_resources = frozenset(r.lower() for r in block_resources)
+        self.block_third_party = block_third_party
+        self.allow_hosts = frozenset(h.lower() for h in allow_hosts)
+        self.blocked = 0                # aborted requests, for the logs
+        self._sem = asyncio.Semaphore(self.max_pages)
+        self._lock = asyncio.Lock()
+        self._pw: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+
+    async def _ensure(self) -> BrowserContext:
+        async with self._lock:
+            if self._browser is not None and not self._browser.is_connected():
+                print("[BROWSER] Chromium disconnected; relaunching")
+                self._browser = self._context = None
+            if self._pw is None:
+                self._pw = await async_playwright().start()
+            if self._browser is None:
+                self._browser = await self._pw.chromium.launch(headless=True)
+                self._context = await self._browser.new_context(user_agent=USER_AGENT)
+                if self.block_resources or self.block_third_party:
+                    await self._context.route("**/*", self._route)
+                print(f"[BROWSER] Chromium launched (max {self.max_pages} pages)")
+            return self._context
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a fresh page from the shared context; closed on exit."""
+        async with self._sem:
+            context = await self._ensure()
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    def _should_block(self, resource_type: str, url: str, page_url: str,
+                      main_document: bool = False) -> bool:
+        if resource_type in self.block_resources:
+            return True
+        if not self.block_third_party or main_document:
+            return False
+        host = (urlparse(url).hostname or "").lower()
+        page_host = (urlparse(page_url).hostname or "").lower()
+        if not host or not page_host or host in self.allow_hosts:
+            return False
+        return _site(host) != _site(page_host)
+
+    async def _route(self, route: Route) -> None:
+        req = route.request
+        try:
+            page_url = req.frame.page.url
+            main_document = req.is_navigation_request() and req.frame.parent_frame is None
+        except Exception:
+            # e.g. service worker requests: no page to compare against
+            page_url, main_document = "", False
+        if self._should_block(req.resource_type, req.url, page_url, main_document):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def close(self) -> None:
+        async with self._lock:
+            for closer in (self._context, self._browser):
+                if closer is not None:
+                    try:
+                        await closer.close()
+                    except Exception:
+                        pass
+            if self._pw is not None:
+                await self._pw.stop()
+            self._pw = self._browser = self._context = None
+
+
+_pool: Optional[BrowserPool] = None
+_pool_loop = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool bound to the running event loop (recreated if the loop changed)."""
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        if _pool is not None:
+            _close_on(_pool, _pool_loop)
+        _pool, _pool_loop = BrowserPool(), loop
+    return _pool
+
+
+def _close_on(pool: BrowserPool, loop) -> None:
+    # the pool's Playwright objects belong to `loop`: its close has to run there
+    if loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(pool.close(), loop)
+    elif pool._pw is not None:
+        print("[BROWSER] event loop gone before close_browser_pool(); Chromium left running")
+
+
+async def close_browser_pool() -> None:
+    global _pool, _pool_loop
+    if _pool is not None:
+        await _pool.close()
+    _pool = _pool_loop = None
@@ -1,8 +1,9 @@
 # back/adapters/events/normalize.py
 from __future__ import annotations
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional
 import re
-from datetime import datetime
+
+from ...dates import parse_date_range
 
 __all__ = ["parse_date_range", "normalize_location"]
 
@@ -21,58 +22,6 @@ ASEAN_CANON = {
     "lao pdr": "Laos",
 }
 
-_MONTHS = {
-    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
-    "JUL": 7, "AUG": 8, "SEP": 9, "SEPT": 9, "OCT": 10, "NOV": 11, "DEC": 12,
-}
-
-def _year_guess() -> int:
-    # basic guess: this year (fallback)
-    return datetime.now().year
-
-def parse_date_range(date_raw: str) -> Tuple[Optional[str], Optional[str]]:
-    """
-    Accepts strings like:
-      'OCT 20–21', 'OCT 20-21', 'OCT 13, 2025', 'DEC 9-10 2026'
-    Returns ISO dates: ('YYYY-MM-DD', 'YYYY-MM-DD|None')
-    If parsing fails, returns (None, None).
-    """
-    if not date_raw:
-        return (None, None)
-    s = date_raw.strip().upper().replace("–", "-").replace("—", "-")
-
-    # Examples: OCT 20-21 [2025]
-    m = re.match(r"^(?P<mon>[A-Z]{3,4})\s+(?P<d1>\d{1,2})(?:\s*-\s*(?P<d2>\d{1,2}))?(?:[, ]+(?P<y>\d{4}))?$", s)
-    if m:
-        mon = _MONTHS.get(m.group("mon"), None)
-        if not mon: 
-            return (None, None)
-        y = int(m.group("y")) if m.group("y") else _year_guess()
-        d1 = int(m.group("d1"))
-        d2 = int(m.group("d2")) if m.group("d2") else None
-        try:
-            start = datetime(y, mon, d1).date().isoformat()
-            end = datetime(y, mon, (d2 or d1)).date().isoformat()
-            return (start, end if d2 else None)
-        except ValueError:
-            return (None, None)
-
-    # Example: OCT 13, 2025 (comma variant)
-    m = re.match(r"^(?P<mon>[A-Z]{3,4})\s+(?P<d1>\d{1,2}),\s*(?P<y>\d{4})$", s)
-    if m:
-        mon = _MONTHS.get(m.group("mon"), None)
-        if not mon: 
-            return (None, None)
-        y = int(m.group("y"))
-        d1 = int(m.group("d1"))
-        try:
-            start = datetime(y, mon, d1).date().isoformat()
-            return (start, None)
-        except ValueError:
-            return (None, None)
-
-    return (None, None)
-
 def normalize_location(location_raw: str) -> Dict[str, Optional[str]]:
     """
     Roughly split a location string into (city, region) and map region to ASEAN canon.
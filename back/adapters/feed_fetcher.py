@@ -0,0 +1,373 @@
+# back/adapters/feed_fetcher.py
+"""
+Concurrent fetch stage for RSS feeds.
+
+Every feed is downloaded concurrently (httpx, bounded connection pool) and
+parsed in a worker thread, so the wall time of a refresh is set by the
+slowest feed (capped by the per-feed timeout) instead of the sum of all
+round-trips.
+
+With RSS_HTTP_CACHE on, each feed's ETag / Last-Modified validators and its
+last parsed entries are kept on disk, so an unchanged feed costs one 304
+and no parsing at all.
+
+With RSS_STREAM_PARSE on, RSS 2.0 / Atom bodies are parsed lazily
+(feed_stream): the worker parses the first RSS_MAX_ITEMS entries (the
+adapter reads at least that many), and anything past that is parsed as the
+consumer iterates, so a consumer that stops at RSS_MAX_ITEMS never parses
+the tail of a long feed. Other shapes, and malformed XML, are re-parsed by
+feedparser. For such feeds the validator cache keeps the entries the
+consumer actually read (what a 304 replay will be read for again), so
+FeedCache.save() must run after the entries have been consumed.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional
+from urllib.parse import urlparse
+
+import feedparser
+import httpx
+
+from ..config import (
+    RSS_FETCH_WORKERS, RSS_FEED_TIMEOUT, RSS_FETCH_DEADLINE, RSS_HTTP_CACHE, RSS_STREAM_PARSE,
+    RSS_MAX_ITEMS,
+)
+from ..json_store import cache_path, load_json, save_json
+from .feed_stream import ParseError, Unsupported, iter_entries
+
+UA = {"User-Agent": "Mozilla/5.0 (ENGIE-NewsBot/1.0)"}
+
+_CHUNK = 64 * 1024
+
+# entry attributes kept in the validator cache (everything get_news_from_rss reads)
+_ENTRY_FIELDS = ("title", "link", "published", "updated", "summary", "description", "source")
+_ENTRY_TIMES = ("published_parsed", "updated_parsed")
+
+
+@dataclass
+class FeedResult:
+    """Outcome of fetching + parsing one feed (timings in milliseconds)."""
+    index: int
+    url: str
+    label: str
+    status: Optional[int] = None
+    not_modified: bool = False       # served from the validator cache (HTTP 304)
+    feed: Any = None                 # feedparser.FeedParserDict or None
+    error: Optional[str] = None
+    nbytes: int = 0
+    fetch_ms: float = 0.0
+    parse_ms: float = 0.0            # grows while StreamedEntries are consumed
+    entries: Any = field(default_factory=list)   # list, or StreamedEntries (parsed on demand)
+
+    @property
+    def total_ms(self) -> float:
+        return self.fetch_ms + self.parse_ms
+
+
+def _feed_label(src) -> tuple[str, str]:
+    url = src.get("url", "") if isinstance(src, dict) else str(src)
+    label = (src.get("name") if isinstance(src, dict) else None) or (urlparse(url).netloc if url else "")
+    return url, label
+
+
+class StreamedEntries:
+    """
+    Entries of a downloaded feed, parsed as far as the caller reads.
+    Iteration can be repeated (parsed entries are kept); len() parses
+    everything. If the streaming reader gives up, feedparser re-parses the
+    body and continues after the entries already handed out.
+    """
+
+    def __init__(self, res: FeedResult, body: bytes, headers: dict):
+        self._res = res
+        self._body, self._headers = body, headers
+        self._parsed: list = []
+        self._source = iter_entries(body)
+        self._read = 0                # entries handed out to a consumer so far
+        self.streamed = True
+
+    def _advance(self) -> bool:
+        """Parse one more entry; False once the feed is exhausted."""
+        t0 = time.perf_counter()
+        try:
+            while self._source is not None:
+                try:
+                    self._parsed.append(next(self._source))
+                    return True
+                except StopIteration:
+                    self._source = self._body = None   # done: release the body
+                except (Unsupported, ParseError) as e:
+                    self._fallback(e)
+            return False
+        finally:
+            self._res.parse_ms += (time.perf_counter() - t0) * 1000
+
+    def _fallback(self, err: Exception) -> None:
+        logging.info("[RSS] %s: streaming parse gave up (%s); using feedparser", self._res.url, err)
+        feed = feedparser.parse(self._body, response_headers=self._headers)
+        if feed.bozo:
+            logging.warning("[RSS] BOZO on %s: %s", self._res.url,
+                            getattr(feed, "bozo_exception", "Unknown parse error"))
+        self.streamed = False
+        self._source = iter(list(getattr(feed, "entries", []) or [])[len(self._parsed):])
+        self._body = None
+
+    def prefetch(self, n: int) -> None:
+        """Parse up to `n` entries now (in the calling worker thread)."""
+        while len(self._parsed) < n and self._advance():
+            pass
+
+    def consumed(self) -> list:
+        """The entries iterated so far (no further parsing)."""
+        return self._parsed[:self._read]
+
+    def __iter__(self):
+        i = 0
+        while i < len(self._parsed) or self._advance():
+            self._read = max(self._read, i + 1)
+            yield self._parsed[i]
+            i += 1
+
+    def __bool__(self) -> bool:
+        return bool(self._parsed) or self._advance()
+
+    def __len__(self) -> int:
+        while self._advance():
+            pass
+        return len(self._parsed)
+
+
+# ---------------------------------------------------------------------
+# Conditional GET cache
+# ---------------------------------------------------------------------
+def _entry_to_json(e) -> dict:
+    out = {}
+    for k in _ENTRY_FIELDS:
+        v = e.get(k)
+        if v:
+            out[k] = dict(v) if isinstance(v, dict) else v
+    for k in _ENTRY_TIMES:
+        v = e.get(k)
+        if v:
+            out[k] = list(v)
+    return out
+
+
+def _entry_from_json(d: dict):
+    e = feedparser.FeedParserDict()
+    for k, v in d.items():
+        if k in _ENTRY_TIMES:
+            e[k] = time.struct_time(v)
+        elif isinstance(v, dict):
+            e[k] = feedparser.FeedParserDict(v)
+        else:
+            e[k] = v
+    return e
+
+
+class FeedCache:
+    """
+    On-disk HTTP validator cache keyed by feed URL:
+      {url: {"etag": ..., "last_modified": ..., "entries": [...]}}
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = load_json(path, {})
+        self._dirty = False
+        self._pending: dict = {}      # url -> entries being consumed (serialized in save)
+
+    def validators(self, url: str) -> dict:
+        rec = self._data.get(url) or {}
+        headers = {}
+        if rec.get("etag"):
+            headers["If-None-Match"] = rec["etag"]
+        if rec.get("last_modified"):
+            headers["If-Modified-Since"] = rec["last_modified"]
+        return headers
+
+    def entries(self, url: str) -> Optional[list]:
+        rec = self._data.get(url)
+        if not rec or "entries" not in rec:
+            return None
+        return [_entry_from_json(d) for d in rec["entries"]]
+
+    def store(self, url: str, headers: dict, entries: list) -> None:
+        etag, last_mod = headers.get("etag"), headers.get("last-modified")
+        with self._lock:
+            if not etag and not last_mod:
+                # nothing to revalidate with next time
+                self._dirty |= self._data.pop(url, None) is not None
+                return
+            self._data[url] = {"etag": etag, "last_modified": last_mod, "entries": []}
+            self._pending[url] = entries
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache; call once the fetched entries have been consumed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            for url, entries in self._pending.items():
+                if isinstance(entries, StreamedEntries):
+                    # only what was read: a 304 replay is read the same way, and the
+                    # unread tail is never parsed
+                    entries = entries.consumed()
+                if entries:
+                    self._data[url]["entries"] = [_entry_to_json(e) for e in entries]
+                else:
+                    # never read (deadline, failed consumer): no validators, full GET next time
+                    self._data.pop(url, None)
+            self._pending.clear()
+            try:
+                save_json(self.path, self._data)
+                self._dirty = False
+            except Exception as e:
+                logging.warning("[RSS] Could not save feed cache %s: %s", self.path, e)
+
+
+# ---------------------------------------------------------------------
+# Fetch + parse
+# ---------------------------------------------------------------------
+def _finish(res: FeedResult, status: int, body: bytes, headers: dict,
+            cache: Optional[FeedCache]) -> FeedResult:
+    """Everything after the download: 304 replay, HTTP errors, parsing, caching."""
+    url = res.url
+    res.status, res.nbytes = status, len(body)
+
+    if status == 304 and cache is not None:
+        cached = cache.entries(url)
+        if cached is not None:
+            res.not_modified = True
+            res.entries = cached
+            res.feed = feedparser.FeedParserDict(bozo=False, entries=cached)
+            return res
+        res.error = "HTTP 304 without cached entries"
+        return res
+    if status >= 400:
+        res.error = f"HTTP {status}"
+        return res
+
+    if RSS_STREAM_PARSE:
+        try:
+            res.entries = StreamedEntries(res, body, headers)
+            res.feed = feedparser.FeedParserDict(bozo=False, entries=res.entries)
+            # parse what the adapter will read anyway here, in parallel across feeds
+            # (feedparser fallback included); the rest stays lazy
+            res.entries.prefetch(max(1, RSS_MAX_ITEMS))
+            if cache is not None and res.entries:
+                cache.store(url, headers, res.entries)
+        except Exception as e:
+            res.error = f"parse: {type(e).__name__}: {e}"
+        return res
+
+    t1 = time.perf_counter()
+    try:
+        feed = feedparser.parse(body, response_headers=headers)
+        res.feed = feed
+        res.entries = list(getattr(feed, "entries", []) or [])
+        if cache is not None and res.entries:
+            cache.store(url, headers, res.entries)
+    except Exception as e:
+        res.error = f"parse: {type(e).__name__}: {e}"
+    res.parse_ms = (time.perf_counter() - t1) * 1000
+    return res
+
+
+def open_feed_cache() -> Optional[FeedCache]:
+    """The on-disk validator cache, or None when RSS_HTTP_CACHE is off."""
+    return FeedCache(cache_path("rss_http_cache.json")) if RSS_HTTP_CACHE else None
+
+
+# ---------------------------------------------------------------------
+# Fetch stage (httpx): downloads on the event loop, parsing in worker threads
+# ---------------------------------------------------------------------
+async def _afetch_one(client: httpx.AsyncClient, index: int, url: str, label: str,
+                      timeout: float, cache: Optional[FeedCache]) -> FeedResult:
+    res = FeedResult(index=index, url=url, label=label)
+    t0 = time.perf_counter()
+
+    async def load() -> FeedResult:
+        headers = dict(UA, **(cache.validators(url) if cache else {}))
+        r = await client.get(url, headers=headers)
+        res.fetch_ms = (time.perf_counter() - t0) * 1000
+        headers = {k.lower(): v for k, v in r.headers.items()}
+        # parsing is CPU-bound: keep it off the event loop
+        return await asyncio.to_thread(_finish, res, r.status_code, r.content, headers, cache)
+
+    try:
+        # `timeout` bounds download + parse; a parse cut off here finishes in its thread, unused
+        return await asyncio.wait_for(load(), timeout)
+    except Exception as e:
+        # a fresh result: a parse thread still running may write to `res` later
+        return FeedResult(index=index, url=url, label=label,
+                          fetch_ms=res.fetch_ms or (time.perf_counter() - t0) * 1000,
+                          error=f"{type(e).__name__}: {e}" if str(e) else type(e).__name__)
+
+
+async def aiter_feeds(feeds, workers: int = RSS_FETCH_WORKERS,
+                      timeout: float = RSS_FEED_TIMEOUT,
+                      deadline: float = RSS_FETCH_DEADLINE,
+                      use_cache: bool = RSS_HTTP_CACHE,
+                      cache: Optional[FeedCache] = None) -> AsyncIterator[FeedResult]:
+    """
+    Download + parse all `feeds` (RSS_FEEDS-style entries) concurrently and
+    yield one FeedResult per feed *as soon as it completes*.
+    Feeds still running when `deadline` expires are yielded with an error.
+    With `use_cache`, feeds are revalidated with conditional GETs and a 304
+    replays the cached entries (FeedResult.not_modified) without parsing;
+    the cache is saved when the caller has finished iterating. A `cache`
+    passed in is used but not saved (the caller saves it).
+    """
+    jobs = []
+    for i, src in enumerate(feeds or []):
+        url, label = _feed_label(src)
+        if url:
+            jobs.append((i, url, label))
+    if not jobs:
+        return
+
+    owned = cache is None and use_cache
+    if owned:
+        cache = FeedCache(cache_path("rss_http_cache.json"))
+    limits = httpx.Limits(max_connections=max(1, min(workers, len(jobs))))
+    async with httpx.AsyncClient(limits=limits, follow_redirects=True, timeout=timeout) as client:
+        tasks = {asyncio.ensure_future(_afetch_one(client, i, url, label, timeout, cache)): (i, url, label)
+                 for i, url, label in jobs}
+        pending = set(tasks)
+        stop_at = time.monotonic() + deadline
+        try:
+            while pending:
+                remaining = stop_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    yield t.result()
+            for t in sorted(pending, key=lambda t: tasks[t][0]):
+                t.cancel()
+                i, url, label = tasks[t]
+                logging.warning("[RSS] DEADLINE hit before %s finished", url)
+                yield FeedResult(index=i, url=url, label=label, error=f"deadline {deadline}s exceeded")
+        finally:
+            for t in tasks:
+                t.cancel()
+            if owned:
+                await asyncio.to_thread(cache.save)
+
+
+async def afetch_feeds(feeds, cache: Optional[FeedCache] = None, **kwargs) -> List[FeedResult]:
+    """
+    Like aiter_feeds, but returns every result in the same order as `feeds`.
+    Entries are read after this returns, so conditional GETs need a `cache`
+    (open_feed_cache()) that the caller save()s once it has read them.
+    """
+    kwargs["use_cache"] = False
+    return sorted([r async for r in aiter_feeds(feeds, cache=cache, **kwargs)], key=lambda r: r.index)
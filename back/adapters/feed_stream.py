@@ -0,0 +1,151 @@
+# back/adapters/feed_stream.py
+"""
+Incremental RSS 2.0 / Atom entry reader (ElementTree XMLPullParser).
+
+feedparser builds the whole document before the first entry is usable, and
+the Google News search feeds carry far more entries than RSS_MAX_ITEMS.
+iter_entries() feeds the body to a pull parser in small chunks, yields one
+entry at a time and discards each <item>/<entry> subtree once converted,
+so the caller's `break` ends the parse and the work done tracks the
+entries actually read, not the feed size.
+
+The stdlib parser (not lxml) is used on purpose: a half-read feed is
+resumed by whichever thread consumes it, and lxml parsers must stay on the
+thread that created them.
+
+Entries are feedparser.FeedParserDict objects with the fields the RSS
+adapter reads (title, link, published(_parsed), updated(_parsed), summary,
+source), so the two parsers are interchangeable downstream. Any other
+document shape raises Unsupported; malformed XML raises
+xml.etree.ElementTree.ParseError. Callers fall back to feedparser in both
+cases.
+"""
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from typing import Iterator
+
+import feedparser
+
+from ..dates import parse_timestamp
+
+try:
+    # same HTML clean-up feedparser applies to summaries (drops <script>, on* attributes, ...)
+    from feedparser.sanitizer import _sanitize_html  # type: ignore
+except Exception:  # pragma: no cover - older/newer feedparser layouts
+    _sanitize_html = None
+
+__all__ = ["Unsupported", "ParseError", "iter_entries"]
+
+ParseError = ET.ParseError
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+_CHUNK = 16 * 1024
+
+
+class Unsupported(Exception):
+    """Not an RSS 2.0 / Atom 1.0 document (RDF, Atom 0.3, HTML error pages, ...)."""
+
+
+def _text(el) -> str:
+    # element text including any inline markup, like feedparser's plain-text fields
+    return "".join(el.itertext()).strip()
+
+
+def _summary(el) -> str:
+    s = _text(el)
+    if _sanitize_html is not None and "<" in s:
+        s = _sanitize_html(s, "utf-8", "text/html").strip()
+    return s
+
+
+def _set_date(entry, key: str, value: str) -> None:
+    if not value or key in entry:
+        return
+    entry[key] = value
+    stamp = parse_timestamp(value)   # memoized in dates.py; pubDates repeat across entries
+    if stamp is not None:
+        entry[key + "_parsed"] = stamp.dt.utctimetuple()
+
+
+def _rss_entry(item) -> feedparser.FeedParserDict:
+    e = feedparser.FeedParserDict()
+    guid = None
+    for child in item:
+        name = child.tag
+        if name == "title":
+            e["title"] = _text(child)
+        elif name == "link" and "link" not in e:
+            e["link"] = _text(child)
+        elif name == "description":
+            e["summary"] = _summary(child)
+        elif name == "pubDate":
+            _set_date(e, "published", _text(child))
+        elif name == "guid":
+            guid = (_text(child), (child.get("isPermaLink") or "true").lower() != "false")
+        elif name == "source":
+            e["source"] = feedparser.FeedParserDict(href=child.get("url") or "", title=_text(child))
+        elif name == _DC_DATE:
+            _set_date(e, "updated", _text(child))
+    if not e.get("link") and guid and guid[1] and guid[0]:
+        e["link"] = guid[0]   # permalink guid stands in for a missing <link>
+    return e
+
+
+def _atom_entry(entry) -> feedparser.FeedParserDict:
+    e = feedparser.FeedParserDict()
+    for child in entry:
+        if not child.tag.startswith(_ATOM):
+            continue
+        name = child.tag[len(_ATOM):]
+        if name == "title":
+            e["title"] = _text(child)
+        elif name == "link" and "link" not in e and child.get("rel", "alternate") == "alternate":
+            e["link"] = child.get("href") or ""
+        elif name == "summary":
+            e["summary"] = _summary(child)
+        elif name == "published":
+            _set_date(e, "published", _text(child))
+        elif name == "updated":
+            _set_date(e, "updated", _text(child))
+        elif name == "source":
+            title = child.find(_ATOM + "title")
+            if title is not None:
+                e["source"] = feedparser.FeedParserDict(title=_text(title))
+    return e
+
+
+def iter_entries(body: bytes) -> Iterator[feedparser.FeedParserDict]:
+    """
+    Yield the entries of an RSS 2.0 / Atom feed lazily, in document order.
+    Raises Unsupported before the first entry if the document is neither.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    convert = tag = None
+    open_elements: list = []      # ancestors of the current element (to detach finished entries)
+    for off in range(0, len(body) + 1, _CHUNK):
+        chunk = body[off:off + _CHUNK]
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()        # end of body: raises if the document is incomplete
+        for event, el in parser.read_events():
+            if event == "start":
+                if convert is None:
+                    # the root element decides the dialect
+                    if el.tag == "rss":
+                        convert, tag = _rss_entry, "item"
+                    elif el.tag == _ATOM + "feed":
+                        convert, tag = _atom_entry, _ATOM + "entry"
+                    else:
+                        raise Unsupported(f"root element {el.tag!r}")
+                open_elements.append(el)
+                continue
+            open_elements.pop()
+            if el.tag != tag:
+                continue
+            entry = convert(el)
+            if open_elements:
+                open_elements[-1].remove(el)   # drop the converted subtree
+            yield entry
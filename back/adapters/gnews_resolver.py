@@ -0,0 +1,243 @@
+# back/adapters/gnews_resolver.py
+"""
+Google News link resolver.
+
+GNews feeds link to news.google.com/rss/articles/<id> redirect pages, so
+the same publisher article has a different Link than in the publisher's
+own feed. This stage expands them to the publisher URL:
+
+  1. persistent cache (CACHE_DIR/gnews_links.json, TTL; failures are cached
+     for a shorter time so a dead link isn't retried every refresh)
+  2. offline decode: older article ids are base64 protobufs carrying the URL
+  3. HTTP: follow redirects, else read the page's data-n-au attribute, else
+     (current ids) ask Google's batchexecute endpoint with the page's
+     signature + timestamp
+
+Only a URL on a non-Google host counts as resolved: consent / sign-in
+interstitials (consent.google.com for EU clients) are failures, never
+publisher links. The HTTP step scrapes undocumented Google endpoints, so
+it is off unless GNEWS_RESOLVE is set.
+
+Lookups of (2)/(3) run concurrently under a per-host rate limit and an
+overall deadline; links not resolved in time keep their GNews URL and are
+retried on the next refresh.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+import httpx
+
+from ..config import (
+    GNEWS_RESOLVE_WORKERS, GNEWS_RESOLVE_RPS, GNEWS_RESOLVE_TIMEOUT, GNEWS_RESOLVE_DEADLINE,
+    GNEWS_RESOLVE_TTL_DAYS, GNEWS_RESOLVE_FAIL_TTL_HOURS,
+)
+from ..json_store import cache_path, load_json, save_json
+
+__all__ = ["is_gnews_link", "decode_gnews_link", "GNewsResolver", "get_gnews_resolver"]
+
+UA = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"}
+
+_URL_IN_BYTES = re.compile(rb"https?://[\x21-\x7e]+")
+_BATCH_URL = "https://news.google.com/_/DotsSplashUi/data/batchexecute"
+_BATCH_HEADERS = {"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"}
+_SIG = re.compile(r'data-n-a-sg="([^"]+)"')
+_TS = re.compile(r'data-n-a-ts="([^"]+)"')
+_BATCH_RESULT = re.compile(r'garturlres\\",\\"(https?://[^"\\]+)')
+_PAGE_URL = re.compile(r'data-n-au="(https?://[^"]+)"')
+# google.com, consent.google.com, www.google.co.uk, ...
+_GOOGLE_HOST = re.compile(r"(?:^|\.)google(?:\.[a-z]{2,3}){1,2}$")
+
+
+def is_gnews_link(u: str) -> bool:
+    try:
+        return urlparse(u).netloc.endswith("news.google.com")
+    except Exception:
+        return False
+
+
+def _publisher_url(u: Optional[str]) -> Optional[str]:
+    """`u` if it points off Google (a publisher), else None."""
+    try:
+        host = (urlparse(u).hostname or "").lower() if u else ""
+    except ValueError:
+        return None
+    if not host or _GOOGLE_HOST.search(host):
+        return None
+    return u
+
+
+def decode_gnews_link(u: str) -> Optional[str]:
+    """Publisher URL embedded in an (older-format) article id, if any."""
+    m = re.search(r"/articles/([A-Za-z0-9_-]+)", u or "")
+    if not m:
+        return None
+    raw = m.group(1)
+    try:
+        data = base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4))
+    except Exception:
+        return None
+    hit = _URL_IN_BYTES.search(data)
+    return _publisher_url(hit.group(0).decode("ascii")) if hit else None
+
+
+def _from_page(final_url: str, html: str) -> Optional[str]:
+    found = _publisher_url(final_url)
+    if found:
+        return found
+    m = _PAGE_URL.search(html or "")
+    return _publisher_url(m.group(1)) if m else None
+
+
+def _batch_body(link: str, html: str) -> Optional[str]:
+    """batchexecute form body for a current-format article id (needs the page's signature/timestamp)."""
+    m_id = re.search(r"/articles/([A-Za-z0-9_-]+)", link)
+    sig, ts = _SIG.search(html or ""), _TS.search(html or "")
+    if not (m_id and sig and ts):
+        return None
+    req = ('["garturlreq",[["X","X",["X","X"],null,null,1,1,"US:en",null,1,null,null,null,null,null,0,1],'
+           '"X","X",1,[1,1,1],1,1,null,0,0,null,0],"%s",%s,"%s"]' % (m_id.group(1), ts.group(1), sig.group(1)))
+    return "f.req=" + quote(json.dumps([[["Fbv4je", req, None, "generic"]]]))
+
+
+def _from_batch(text: str) -> Optional[str]:
+    m = _BATCH_RESULT.search(text or "")
+    return _publisher_url(m.group(1)) if m else None
+
+
+class _HostLimiter:
+    """At most `rps` request starts per second per host (reservations, so callers sleep outside the lock)."""
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        if not self.interval:
+            return 0.0
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+            return start - now
+
+
+class GNewsResolver:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._map: Dict[str, list] = load_json(path, {}) or {}   # gnews link -> [resolved or None, stored at]
+        self._limiter = _HostLimiter(GNEWS_RESOLVE_RPS)
+        self._dirty = False
+
+    # ---------- cache ----------
+    def lookup(self, link: str) -> Tuple[bool, Optional[str]]:
+        """(hit, resolved). A hit with resolved=None is a cached failure."""
+        with self._lock:
+            entry = self._map.get(link)
+        if not entry:
+            return False, None
+        resolved, ts = entry
+        if resolved and not _publisher_url(resolved):
+            return False, None     # Google interstitial cached by an older build: resolve again
+        ttl = GNEWS_RESOLVE_TTL_DAYS * 86400 if resolved else GNEWS_RESOLVE_FAIL_TTL_HOURS * 3600
+        if time.time() - ts > ttl:
+            return False, None
+        return True, resolved
+
+    def _store(self, link: str, resolved: Optional[str]) -> None:
+        with self._lock:
+            self._map[link] = [resolved, time.time()]
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            keep = GNEWS_RESOLVE_TTL_DAYS * 86400
+            self._map = {k: v for k, v in self._map.items() if now - v[1] <= keep}
+            data, self._dirty = dict(self._map), False
+        try:
+            save_json(self.path, data)
+        except Exception as e:
+            print(f"[GNEWS] Could not save {self.path}: {e}")
+
+    # ---------- resolving ----------
+    def _pending(self, links: Iterable[str]) -> Tuple[Dict[str, Optional[str]], List[str]]:
+        out: Dict[str, Optional[str]] = {}
+        todo: List[str] = []
+        for link in dict.fromkeys(l for l in links if is_gnews_link(l)):
+            hit, resolved = self.lookup(link)
+            if hit:
+                out[link] = resolved
+                continue
+            decoded = decode_gnews_link(link)
+            if decoded:
+                self._store(link, decoded)
+                out[link] = decoded
+            else:
+                todo.append(link)
+        return out, todo
+
+    async def _aresolve_one(self, client: httpx.AsyncClient, sem: asyncio.Semaphore, link: str) -> Optional[str]:
+        async with sem:
+            try:
+                await asyncio.sleep(self._limiter.reserve(link))
+                r = await client.get(link)
+                html = r.text if r.is_success else ""
+                found = _from_page(str(r.url), html)
+                body = None if found else _batch_body(link, html)
+                if body is None:
+                    return found
+                await asyncio.sleep(self._limiter.reserve(_BATCH_URL))
+                r = await client.post(_BATCH_URL, content=body, headers=_BATCH_HEADERS)
+                return _from_batch(r.text) if r.is_success else None
+            except httpx.HTTPError:
+                return None
+
+    async def aresolve_many(self, links: Iterable[str]) -> Dict[str, Optional[str]]:
+        """gnews link -> publisher URL (None when unresolved) for every GNews link given."""
+        out, todo = self._pending(links)
+        if todo:
+            t0 = time.perf_counter()
+            sem = asyncio.Semaphore(GNEWS_RESOLVE_WORKERS)
+            async with httpx.AsyncClient(headers=UA, follow_redirects=True,
+                                         timeout=GNEWS_RESOLVE_TIMEOUT) as client:
+                tasks = {asyncio.ensure_future(self._aresolve_one(client, sem, l)): l for l in todo}
+                done, not_done = await asyncio.wait(tasks, timeout=GNEWS_RESOLVE_DEADLINE)
+                for t in not_done:
+                    t.cancel()
+            for t in done:
+                link = tasks[t]
+                out[link] = t.result()
+                self._store(link, out[link])
+            for t in not_done:
+                out[tasks[t]] = None
+            print(f"[GNEWS] resolved {sum(1 for t in done if t.result())}/{len(todo)} links "
+                  f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        await asyncio.to_thread(self.save)
+        return out
+
+
+_RESOLVER: Optional[GNewsResolver] = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def get_gnews_resolver() -> GNewsResolver:
+    """Process-wide resolver, cache loaded lazily from CACHE_DIR."""
+    global _RESOLVER
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = GNewsResolver(cache_path("gnews_links.json"))
+        return _RESOLVER
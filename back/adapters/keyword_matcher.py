@@ -0,0 +1,78 @@
+# back/adapters/keyword_matcher.py
+"""
+Multi-keyword substring matcher compiled once from the config keyword lists.
+
+The keywords are folded into a trie and emitted as one nested alternation
+regex, e.g. ['power', 'power grid', 'solar'] ->
+
+    (?=(power(?:\\ grid)?|solar))
+
+The zero-width lookahead lets a single `finditer` pass try every start
+position of the (lowercased) title, so overlapping keywords are all found,
+just like the old per-keyword `k.lower() in title` scans. At each position
+the regex reports the longest keyword; shorter keywords that are prefixes
+of it are added from a precomputed table.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Iterable, List
+
+_END = ""  # trie terminal marker (real edges are single characters)
+
+
+def _trie_regex(node: dict) -> str:
+    edges = sorted(k for k in node if k != _END)
+    alts = [re.escape(ch) + _trie_regex(node[ch]) for ch in edges]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if _END in node:
+        # greedy optional: longest keyword wins, prefixes come from _prefixes
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher over a fixed keyword list."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._orig: Dict[str, List[str]] = {}     # lowered -> original spellings
+        for k in keywords or []:
+            self._orig.setdefault(k.lower(), []).append(k)
+
+        # "" is a substring of everything
+        self._always = frozenset([""]) if "" in self._orig else frozenset()
+        lowered = [k for k in self._orig if k]
+
+        trie: dict = {}
+        for k in lowered:
+            node = trie
+            for ch in k:
+                node = node.setdefault(ch, {})
+            node[_END] = True
+
+        # keyword -> every keyword that is a prefix of it (itself included)
+        kwset = set(lowered)
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            k: frozenset(k[:p] for p in range(1, len(k) + 1) if k[:p] in kwset)
+            for k in lowered
+        }
+
+        self._rx = re.compile("(?=(" + _trie_regex(trie) + "))") if lowered else None
+
+    def find_lowered(self, text_lower: str) -> FrozenSet[str]:
+        """Set of *lowercased* keywords occurring in an already-lowercased text."""
+        if self._rx is None:
+            return self._always
+        hits = set(self._always)
+        for m in self._rx.finditer(text_lower):
+            hits.update(self._prefixes[m.group(1)])
+        return frozenset(hits)
+
+    def find(self, text: str) -> List[str]:
+        """Original spellings of all keywords occurring in `text` (case-insensitive)."""
+        out: List[str] = []
+        for k in self.find_lowered((text or "").lower()):
+            out.extend(self._orig[k])
+        return out
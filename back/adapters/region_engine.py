@@ -0,0 +1,72 @@
+# back/adapters/region_engine.py
+"""
+Title -> regions lookup.
+
+All country patterns are compiled into ONE case-insensitive regex, so a
+title is scanned once no matter how many countries / city aliases are
+configured. Each country is an optional zero-width lookahead with a named
+group: at every position where any alias starts, every country whose alias
+starts there is reported, so an alias inside another country's match (e.g.
+'Guinea' in 'Papua New Guinea') is still found, which a plain alternation
+would miss. Results are memoized per title (bounded LRU) because the same
+headline shows up across feeds and refreshes.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+_DASHES = re.compile(r"[-–—]")
+
+
+class RegionEngine:
+    def __init__(self, patterns: Dict[str, Sequence[str]], priority: Sequence[str],
+                 cache_size: int = 4096):
+        self._prio = {c: i for i, c in enumerate(priority)}
+        # stable: unknown countries keep their config order after the ranked ones
+        order = {c: i for i, c in enumerate(patterns)}
+        self._rank = {c: (self._prio.get(c, 999), order[c]) for c in patterns}
+
+        names: Dict[str, str] = {}
+        alts = []
+        for i, (country, pats) in enumerate(patterns.items()):
+            if not pats:
+                continue
+            name = "r%d_%s" % (i, re.sub(r"\W", "_", country))
+            names[name] = country
+            alts.append((name, "|".join(f"(?:{p})" for p in pats)))
+        # (?=any alias) only stops where something matches; each (?=(?P<country>...))? records it
+        self._rx = re.compile(
+            "(?=" + "|".join(a for _, a in alts) + ")" + "".join(f"(?=(?P<{n}>{a}))?" for n, a in alts),
+            re.IGNORECASE,
+        ) if alts else None
+        # group number -> country (patterns may carry their own groups, so not 1..n)
+        self._groups: List[Tuple[int, str]] = [(self._rx.groupindex[n], c) for n, c in names.items()] if alts else []
+        self._total = len(self._groups)
+
+        self._lookup = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, title: str) -> Tuple[str, ...]:
+        if self._rx is None or not title:
+            return ()
+        # Hyphens / dashes -> spaces so 'Vietnam-Malaysia-Singapore' matches all three
+        t = _DASHES.sub(" ", title)
+        found = set()
+        for m in self._rx.finditer(t):
+            found.update(c for g, c in self._groups if m.start(g) >= 0)
+            if len(found) == self._total:
+                break
+        return tuple(sorted(found, key=self._rank.__getitem__))
+
+    def regions(self, title: str) -> List[str]:
+        """Every matched country, in priority order (fresh list per call)."""
+        return list(self._lookup(title or ""))
+
+    def primary(self, regions: Sequence[str], default: str = "Global") -> str:
+        if not regions:
+            return default
+        return min(regions, key=lambda c: self._prio.get(c, 999))
+
+    def cache_info(self):
+        return self._lookup.cache_info()
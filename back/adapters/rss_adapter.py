@@ -1,16 +1,25 @@
 # back/adapters/rss_adapter.py
+import asyncio
 import re
+import time
 import logging
-import feedparser
 from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterator
 from urllib.parse import urlparse, urlunparse
-from dateutil import parser as dtparser
 
 # ✅ relative import from back.config
 from ..config import (
-    RSS_FEEDS, RSS_ENABLED, RSS_MAX_ITEMS,
-    TITLE_KEYWORDS_ANY, TITLE_KEYWORDS_ALL,
+    RSS_FEEDS, RSS_ENABLED, RSS_MAX_ITEMS, GNEWS_RESOLVE,
+    TITLE_KEYWORDS_ANY, TITLE_KEYWORDS_ALL, REGION_CACHE_SIZE,
 )
+from ..dates import now_timestamp, parse_timestamp
+from ..models import Article
+from ..metrics import FEED_BYTES, FEED_FETCHES, FEED_SECONDS, RSS_ITEMS, STAGE_SECONDS, stage, timed
+from ..seen_store import get_seen_store
+from .feed_fetcher import afetch_feeds, aiter_feeds, open_feed_cache
+from .gnews_resolver import get_gnews_resolver
+from .keyword_matcher import KeywordMatcher
+from .region_engine import RegionEngine
 
 UA = {"User-Agent": "Mozilla/5.0 (ENGIE-NewsBot/1.0)"}
 
@@ -57,27 +66,20 @@ def _gnews_source_name(entry, fallback: str) -> str:
         pass
     return fallback
 
-def _to_iso(dt_value) -> str:
-    try:
-        if hasattr(dt_value, "tm_year"):
-            d = datetime(*dt_value[:6], tzinfo=timezone.utc)
-            return d.replace(microsecond=0).isoformat()
-        if isinstance(dt_value, str) and dt_value.strip():
-            d = dtparser.parse(dt_value)
-            if not d.tzinfo:
-                d = d.replace(tzinfo=timezone.utc)
-            return d.astimezone(timezone.utc).replace(microsecond=0).isoformat()
-    except Exception:
-        pass
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-
 # ---------------------------------------------------------------------
 # Title keyword gate (existing behavior)
 # ---------------------------------------------------------------------
+# Both lists compiled once into a single matcher; one pass per title finds every keyword.
+_TITLE_MATCHER = KeywordMatcher(list(TITLE_KEYWORDS_ANY or []) + list(TITLE_KEYWORDS_ALL or []))
+_ANY_BY_LOWER = {}
+for _k in (TITLE_KEYWORDS_ANY or []):
+    _ANY_BY_LOWER.setdefault(_k.lower(), []).append(_k)
+_ALL_LOWER = frozenset(k.lower() for k in (TITLE_KEYWORDS_ALL or []))
+
 def _title_matches_and_keywords(title: str):
-    t = (title or "").lower()
-    any_present = [k for k in (TITLE_KEYWORDS_ANY or []) if k.lower() in t]
-    all_ok = all(k.lower() in t for k in (TITLE_KEYWORDS_ALL or []))
+    hits = _TITLE_MATCHER.find_lowered((title or "").lower())
+    any_present = [k for low in hits if low in _ANY_BY_LOWER for k in _ANY_BY_LOWER[low]]
+    all_ok = _ALL_LOWER <= hits
     keep = True
     if TITLE_KEYWORDS_ANY and not any_present:
         keep = False
@@ -107,29 +109,16 @@ _REGION_PATTERNS = {
 # Priority to choose a primary when multiple are detected
 _REGION_PRIORITY = ["Singapore", "Malaysia", "Philippines", "Indonesia", "Vietnam", "Thailand"]
 
+# Compiled once: one combined regex scan per title, LRU-cached by title
+_REGION_ENGINE = RegionEngine(_REGION_PATTERNS, _REGION_PRIORITY, cache_size=REGION_CACHE_SIZE)
+
 def _extract_regions_from_title(title: str):
     """
     Return 0..N regions based on title text alone (first priority).
     Hyphens / en-dashes / em-dashes are normalized to spaces so
     'Vietnam-Malaysia-Singapore' matches all three.
     """
-    t_original = (title or "")
-    # Normalize hyphens/dashes to spaces to restore word boundaries
-    t = re.sub(r"[-–—]", " ", t_original)
-    found = []
-    for country, patterns in _REGION_PATTERNS.items():
-        for pat in patterns:
-            if re.search(pat, t, flags=re.IGNORECASE):
-                found.append(country)
-                break
-    # de-dup, then sort by priority
-    uniq = []
-    for c in found:
-        if c not in uniq:
-            uniq.append(c)
-    prio_index = {c: i for i, c in enumerate(_REGION_PRIORITY)}
-    uniq.sort(key=lambda c: prio_index.get(c, 999))
-    return uniq
+    return _REGION_ENGINE.regions(title)
 
 def _infer_regions_from_source_link(source: str, link: str):
     """Fallback to your original single-region mapping using source/link; returns [] or [one country]."""
@@ -161,10 +150,7 @@ def _infer_regions_title_first(title: str, source: str, link: str):
 
 def _pick_primary_region(regions):
     """Pick one primary region for backward compatibility; default Global."""
-    if not regions:
-        return "Global"
-    prio_index = {c: i for i, c in enumerate(_REGION_PRIORITY)}
-    return sorted(regions, key=lambda c: prio_index.get(c, 999))[0]
+    return _REGION_ENGINE.primary(regions, default="Global")
 
 # 🔒 Backward-compat shim (in case other modules import _infer_region)
 def _infer_region(source: str, link: str) -> str:
@@ -175,87 +161,207 @@ def _infer_region(source: str, link: str) -> str:
 # ---------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------
-def get_news_from_rss(days_limit: int = 7) -> list:
-    if not RSS_ENABLED or not RSS_FEEDS:
-        return []
+def _observe_feed(res) -> None:
+    feed = res.label or res.url
+    status = "error" if res.error else str(res.status or "unknown")
+    FEED_FETCHES.inc(feed=feed, status=status)
+    FEED_BYTES.inc(res.nbytes or 0, feed=feed)
+    FEED_SECONDS.observe(res.fetch_ms / 1000, phase="fetch")
 
-    since = datetime.now(timezone.utc) - timedelta(days=days_limit)
-    items, seen = [], set()
-    print(f"[RSS] Loaded {len(RSS_FEEDS)} feeds from config")
+def _items_from_feed(res, since: datetime, seen: set, store) -> Iterator[Article]:
+    """Turn one fetched feed into Article records (shared by list + streaming paths)."""
+    _observe_feed(res)
+    outcomes = dict.fromkeys(("kept", "duplicate", "already_stored", "too_old", "title_filtered"), 0)
+    try:
+        yield from _feed_items(res, since, seen, store, outcomes)
+    finally:
+        # entries may be parsed lazily while they are read, so parse time is final only now
+        if not res.error and not res.not_modified:
+            FEED_SECONDS.observe(res.parse_ms / 1000, phase="parse")
+        for outcome, n in outcomes.items():
+            if n:
+                RSS_ITEMS.inc(n, outcome=outcome)
 
-    for src in RSS_FEEDS:
-        url = src.get("url", "") if isinstance(src, dict) else str(src)
-        label = (src.get("name") if isinstance(src, dict) else None) or _source_from_url(url)
-        if not url:
+def _feed_items(res, since: datetime, seen: set, store, outcomes: dict) -> Iterator[Article]:
+    url, label = res.url, res.label
+    if res.error:
+        logging.warning("[RSS] FAILED %s: %s", url, res.error)
+        print(f"[RSS] {label} -> failed after {res.total_ms:.0f} ms ({res.error})")
+        return
+
+    feed = res.feed
+    if feed.bozo:
+        logging.warning("[RSS] BOZO on %s: %s", url, getattr(feed, "bozo_exception", "Unknown parse error"))
+    if not res.entries:
+        logging.warning("[RSS] EMPTY feed: %s", url)
+        return
+
+    kept, skipped = 0, 0
+    resolver = get_gnews_resolver() if GNEWS_RESOLVE else None
+    watermark = store.watermark(url) if store is not None else None
+    for e in res.entries:
+        title = (getattr(e, "title", "") or "").strip()
+        link = _canonical_url(getattr(e, "link", "") or "")
+        gnews_link = _is_gnews(link)
+        if gnews_link and resolver is not None:
+            # publisher URL from earlier refreshes, so seen / dedupe checks see the real link
+            _, resolved = resolver.lookup(link)
+            if resolved:
+                link = _canonical_url(resolved)
+        if not title or not link or link in seen:
+            outcomes["duplicate"] += 1
             continue
 
-        feed = feedparser.parse(url, request_headers=UA)
-        if feed.bozo:
-            logging.warning("[RSS] BOZO on %s: %s", url, getattr(feed, "bozo_exception", "Unknown parse error"))
-        if not getattr(feed, "entries", []):
-            logging.warning("[RSS] EMPTY feed: %s", url)
+        # Incremental: already written in an earlier refresh
+        if store is not None and store.is_seen(link):
+            skipped += 1
+            outcomes["already_stored"] += 1
             continue
 
-        kept = 0
-        for e in feed.entries:
-            if RSS_MAX_ITEMS and kept >= RSS_MAX_ITEMS:
-                break
+        # Published time handling: parsed once, datetime for the checks, ISO for storage
+        published = getattr(e, "published", None)
+        published_parsed = getattr(e, "published_parsed", None)
+        ts, ts_str = parse_timestamp(published_parsed or published) or now_timestamp()
+        if ts < since:
+            outcomes["too_old"] += 1
+            continue
+        # Incremental: older than the newest item already written from this feed
+        if watermark and ts < watermark:
+            skipped += 1
+            outcomes["already_stored"] += 1
+            continue
 
-            title = (getattr(e, "title", "") or "").strip()
-            link = _canonical_url(getattr(e, "link", "") or "")
-            if not title or not link or link in seen:
-                continue
+        # Title-keyword gate (existing behavior)
+        keep, matched_keywords = _title_matches_and_keywords(title)
+        if not keep:
+            outcomes["title_filtered"] += 1
+            continue
 
-            # Title-keyword gate (existing behavior)
-            keep, matched_keywords = _title_matches_and_keywords(title)
-            if not keep:
-                continue
+        source_label = label or _source_from_url(link)
+        # If it's a GNews link or feed, repair the source label to the real publisher
+        if gnews_link or _is_gnews(url):
+            source_label = _gnews_source_name(e, source_label)
+
+        # Summary: blank for GNews (to avoid duplicates/boilerplate), else trimmed
+        if gnews_link:
+            summary = ""
+        else:
+            summary = (getattr(e, "summary", "") or getattr(e, "description", "") or "").strip()[:300]
+
+        # --- Region inference (title-first, multiple allowed) ---
+        regions = _infer_regions_title_first(title, source_label, link)
+        primary_region = _pick_primary_region(regions)
+
+        yield Article(
+            title=title,
+            link=link,
+            source=source_label,
+            published_at=ts_str,
+            summary=summary,
+            topic=tuple(matched_keywords),           # chips (Keywords is the joined text form)
+            regions=tuple(regions),                  # e.g. ("Singapore", "Malaysia")
+            region=primary_region,                   # primary for backward compatibility
+            feed=url,                                # originating feed (incremental watermark key)
+        )
+
+        seen.add(link)
+        kept += 1
+        outcomes["kept"] += 1
+        # stop before reading another entry: with streamed entries the rest is never parsed
+        if RSS_MAX_ITEMS and kept >= RSS_MAX_ITEMS:
+            break
+
+    parse_note = "304 cached" if res.not_modified else f"parse {res.parse_ms:.0f} ms"
+    skip_note = f", {skipped} already stored" if store is not None else ""
+    print(f"[RSS] {label} -> kept {kept} items (max {RSS_MAX_ITEMS}{skip_note}) "
+          f"[fetch {res.fetch_ms:.0f} ms, {parse_note}, {res.nbytes} bytes]")
 
-            source_label = label or _source_from_url(link)
-            # If it's a GNews link or feed, repair the source label to the real publisher
-            if _is_gnews(link) or _is_gnews(url):
-                source_label = _gnews_source_name(e, source_label)
-
-            # Published time handling
-            published = getattr(e, "published", None)
-            published_parsed = getattr(e, "published_parsed", None)
-            ts_str = _to_iso(published_parsed or published)
-            try:
-                ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-            except Exception:
-                ts = None
-            if ts and ts < since:
+
+def _apply_resolved(items: list, mapping: dict, store) -> list:
+    out = []
+    for it in items:
+        real = mapping.get(it.link)
+        if real:
+            it.link = _canonical_url(real)
+            # stored earlier under its publisher URL (e.g. via the publisher's own feed)
+            if store is not None and store.is_seen(it.link):
+                RSS_ITEMS.inc(outcome="already_stored")
                 continue
+        out.append(it)
+    return out
+
+async def _aresolve_gnews(items: list, store) -> list:
+    """Expand remaining news.google.com links to publisher URLs (see gnews_resolver)."""
+    pending = [it.link for it in items if _is_gnews(it.link)]
+    if not GNEWS_RESOLVE or not pending:
+        return items
+    with stage("rss.resolve_gnews"):
+        mapping = await get_gnews_resolver().aresolve_many(pending)
+    return _apply_resolved(items, mapping, store)
+
+def _prepare(days_limit: int, incremental: bool):
+    since = datetime.now(timezone.utc) - timedelta(days=days_limit)
+    store = get_seen_store() if incremental else None
+    print(f"[RSS] Loaded {len(RSS_FEEDS)} feeds from config")
+    return since, store
+
+
+@timed("rss.get_news")
+async def aget_news_from_rss(days_limit: int = 7, incremental: bool = False) -> list:
+    """
+    Fetch all RSS_FEEDS and return Article records, in feed order.
+    Feeds are downloaded on the event loop and parsed in threads.
+    With `incremental`, entries whose link is already in the seen-link store,
+    or older than their feed's watermark, are dropped before any filtering.
+    """
+    if not RSS_ENABLED or not RSS_FEEDS:
+        return []
+    since, store = _prepare(days_limit, incremental)
+    items, seen = [], set()
 
-            # Summary: blank for GNews (to avoid duplicates/boilerplate), else trimmed
-            if _is_gnews(link):
-                summary = ""
-            else:
-                summary = (getattr(e, "summary", "") or getattr(e, "description", "") or "").strip()[:300]
-
-            # --- Region inference (title-first, multiple allowed) ---
-            regions = _infer_regions_title_first(title, source_label, link)
-            primary_region = _pick_primary_region(regions)
-            regions_text = ", ".join(regions) if regions else ""
-
-            items.append({
-                "Title": title,
-                "Link": link,
-                "Source": source_label,
-                "PublishedAt": ts_str,
-                "Summary": summary,
-                "Topic": matched_keywords,                 # chips
-                "Keywords": ", ".join(matched_keywords),   # text form
-
-                # 🔹 New fields (multi-region support)
-                "Regions": regions,                        # e.g., ["Singapore","Malaysia"]
-                "Region": primary_region,                  # primary for backward compatibility
-                "RegionsText": regions_text,               # "Singapore, Malaysia" (Airtable/CSV-friendly)
-            })
-
-            seen.add(link)
-            kept += 1
-
-        print(f"[RSS] {label} -> kept {kept} items (max {RSS_MAX_ITEMS})")
+    t_start = time.perf_counter()
+    cache = open_feed_cache()
+    with stage("rss.fetch_feeds"):
+        results = await afetch_feeds(RSS_FEEDS, cache=cache)
 
+    def collect():
+        # entries are parsed while they are read: keep that off the event loop
+        for res in results:
+            items.extend(_items_from_feed(res, since, seen, store))
+        if cache is not None:
+            cache.save()
+
+    await asyncio.to_thread(collect)
+    items = await _aresolve_gnews(items, store)
+
+    print(f"[RSS] Fetch stage done: {len(results)} feeds in {(time.perf_counter() - t_start) * 1000:.0f} ms")
     return items
+
+
+async def aiter_news_from_rss(days_limit: int = 7, incremental: bool = False) -> AsyncIterator[Article]:
+    """
+    Streaming variant of aget_news_from_rss: yields items feed-by-feed in
+    *completion* order, so fast feeds flow downstream while slow ones are
+    still downloading. When two feeds carry the same link, whichever
+    finishes first wins (the list variant always prefers RSS_FEEDS order).
+    """
+    if not RSS_ENABLED or not RSS_FEEDS:
+        return
+    since, store = _prepare(days_limit, incremental)
+    seen: set = set()
+
+    t_start = time.perf_counter()
+    n = 0
+    async for res in aiter_feeds(RSS_FEEDS):
+        n += 1
+        batch = await asyncio.to_thread(lambda: list(_items_from_feed(res, since, seen, store)))
+        for it in await _aresolve_gnews(batch, store):
+            yield it
+
+    STAGE_SECONDS.observe(time.perf_counter() - t_start, stage="rss.stream")
+    print(f"[RSS] Fetch stage done: {n} feeds in {(time.perf_counter() - t_start) * 1000:.0f} ms")
+
+
+def get_news_from_rss(days_limit: int = 7, incremental: bool = False) -> list:
+    """Blocking wrapper (CLI / scripts / benchmarks) around aget_news_from_rss."""
+    return asyncio.run(aget_news_from_rss(days_limit=days_limit, incremental=incremental))
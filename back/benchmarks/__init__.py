@@ -0,0 +1,15 @@
+# back/benchmarks/__init__.py
+"""
+Offline benchmarks for the news + events ingestion pipelines.
+
+    python -m back.benchmarks                      # run all, compare to baseline.json
+    python -m back.benchmarks --only rss,aca       # subset (name prefixes)
+    python -m back.benchmarks --save-baseline      # record a new baseline
+    python -m back.benchmarks --check              # exit 1 on regression (CI)
+    python -m back.benchmarks.fixtures --record    # re-record RSS fixtures (needs network)
+
+Everything runs against recorded fixtures (fixtures/rss/*.xml, back/_debug/aca_*.html,
+reuters_energy_debug.html) served by a local mock of the feeds + Supabase REST API,
+so numbers don't depend on the network. Baselines are machine-specific: record
+them on the machine you compare on.
+"""
@@ -0,0 +1,117 @@
+# back/benchmarks/fixtures.py
+"""
+Benchmark inputs.
+
+RSS: one XML file per RSS_FEEDS entry under fixtures/rss/. `--record` downloads
+the live feeds; without network they are rebuilt from back/rss_preview.json
+(a real crawl saved by debug_rss.py), so the committed files stay reproducible.
+HTML: the saved ACA country pages and the 2.2 MB Reuters page.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACK = os.path.dirname(HERE)
+ROOT = os.path.dirname(BACK)
+
+RSS_DIR = os.path.join(HERE, "fixtures", "rss")
+PREVIEW_JSON = os.path.join(BACK, "rss_preview.json")
+
+ACA_HTML = [
+    ("Singapore",   os.path.join(BACK, "_debug", "aca_singapore.html")),
+    ("Malaysia",    os.path.join(BACK, "_debug", "aca_malaysia.html")),
+    ("Philippines", os.path.join(BACK, "_debug", "aca_philippines.html")),
+    ("Reuters",     os.path.join(ROOT, "reuters_energy_debug.html")),
+]
+
+
+def feed_slug(feed: Dict) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", feed["name"].lower()).strip("-")
+
+
+def rss_path(feed: Dict) -> str:
+    return os.path.join(RSS_DIR, feed_slug(feed) + ".xml")
+
+
+def read_text(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _rss_xml(feed: Dict, items: List[Dict]) -> str:
+    gnews = "news.google.com" in feed["url"]
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0"><channel>',
+        f"<title>{escape(feed['name'])}</title>",
+        f"<link>{escape(feed['url'])}</link>",
+        "<description>benchmark fixture</description>",
+    ]
+    for it in items:
+        pub = datetime.fromisoformat(it["PublishedAt"].replace("Z", "+00:00"))
+        out.append("<item>")
+        out.append(f"<title>{escape(it['Title'])}</title>")
+        out.append(f"<link>{escape(it['Link'])}</link>")
+        out.append(f"<guid>{escape(it['Link'])}</guid>")
+        out.append(f"<pubDate>{format_datetime(pub)}</pubDate>")
+        if gnews:
+            m = re.search(r"\s[-–]\s([^–-]+)$", it["Title"])
+            if m:
+                out.append(f'<source url="https://example.com">{escape(m.group(1).strip())}</source>')
+        out.append(f"<description>{escape(it.get('Summary') or '')}</description>")
+        out.append("</item>")
+    out.append("</channel></rss>")
+    return "\n".join(out) + "\n"
+
+
+def build_from_preview(feeds: List[Dict]) -> List[str]:
+    with open(PREVIEW_JSON, encoding="utf-8") as f:
+        preview = json.load(f)
+    by_source: Dict[str, List[Dict]] = {}
+    for it in preview:
+        by_source.setdefault(it.get("Source") or "", []).append(it)
+    os.makedirs(RSS_DIR, exist_ok=True)
+    written = []
+    for feed in feeds:
+        path = rss_path(feed)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_rss_xml(feed, by_source.get(feed["name"], [])))
+        written.append(path)
+    return written
+
+
+def record(feeds: List[Dict]) -> List[str]:
+    import requests
+
+    os.makedirs(RSS_DIR, exist_ok=True)
+    written = []
+    for feed in feeds:
+        r = requests.get(feed["url"], timeout=20, headers={"User-Agent": "Mozilla/5.0 (ENGIE-NewsBot/1.0)"})
+        r.raise_for_status()
+        with open(rss_path(feed), "wb") as f:
+            f.write(r.content)
+        written.append(rss_path(feed))
+    return written
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="(Re)build benchmark RSS fixtures")
+    ap.add_argument("--record", action="store_true", help="download the live feeds instead")
+    args = ap.parse_args(argv)
+
+    from back.config import RSS_FEEDS
+    paths = record(RSS_FEEDS) if args.record else build_from_preview(RSS_FEEDS)
+    for p in paths:
+        print(f"[BENCH] wrote {os.path.relpath(p, ROOT)} ({os.path.getsize(p)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# back/benchmarks/mock_server.py
+"""
+Local stand-in for the RSS hosts and the Supabase REST (PostgREST) API.
+
+  GET  /rss/<slug>.xml      -> fixtures/rss/<slug>.xml
+  POST /rest/v1/<table>     -> echoes the rows (or Content-Range only with return=minimal)
+  GET  /rest/v1/<table>     -> []
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .fixtures import RSS_DIR
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real endpoints
+
+    def log_message(self, *args):  # quiet
+        pass
+
+    def _send(self, status: int, body: bytes, ctype: str = "application/json", extra=None):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (extra or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/rss/"):
+            fname = os.path.join(RSS_DIR, os.path.basename(path))
+            if not os.path.isfile(fname):
+                return self._send(404, b"not found", "text/plain")
+            with open(fname, "rb") as f:
+                return self._send(200, f.read(), "application/rss+xml")
+        if path.startswith("/rest/v1/"):
+            return self._send(200, b"[]")
+        self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        rows = json.loads(body or b"[]")
+        self.server.posted_rows += len(rows)
+        if "return=minimal" in (self.headers.get("Prefer") or ""):
+            return self._send(201, b"", extra={"Content-Range": f"*/{len(rows)}"})
+        self._send(201, json.dumps(rows).encode("utf-8"))
+
+
+class MockServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.posted_rows = 0
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,230 @@
+# back/benchmarks/run.py
+"""Benchmark runner: timings, p50/p99, throughput, peak memory, baseline compare."""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional
+
+from .fixtures import ACA_HTML, HERE, PREVIEW_JSON, feed_slug, read_text
+from .mock_server import MockServer
+
+BASELINE = os.path.join(HERE, "baseline.json")
+
+# (metric, bigger is better, gates --check); p99 is reported only: too noisy on short runs
+_METRICS = (
+    ("p50_ms", False, True),
+    ("p99_ms", False, False),
+    ("throughput", True, True),
+    ("peak_kb", False, True),
+)
+
+
+@dataclass
+class Bench:
+    name: str
+    fn: Callable[[], int]      # one run; returns the number of items processed
+    repeat: int
+    unit: str = "items"
+
+
+def _percentile(values: List[float], p: float) -> float:
+    s = sorted(values)
+    return s[max(0, math.ceil(p / 100 * len(s)) - 1)]
+
+
+def measure(b: Bench, repeat: Optional[int] = None, warmup: int = 1) -> Dict:
+    repeat = repeat or b.repeat
+    for _ in range(warmup):
+        b.fn()
+    lat, items = [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        items += b.fn()
+        lat.append(time.perf_counter() - t0)
+
+    # separate run: tracemalloc slows allocation-heavy code (C-level allocs, e.g. lxml, not counted)
+    tracemalloc.start()
+    try:
+        b.fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": repeat,
+        "items_per_run": items // repeat,
+        "p50_ms": round(_percentile(lat, 50) * 1000, 3),
+        "p99_ms": round(_percentile(lat, 99) * 1000, 3),
+        "throughput": round(items / sum(lat), 1) if sum(lat) else 0.0,
+        "peak_kb": round(peak / 1024, 1),
+        "unit": b.unit,
+    }
+
+
+# ---------------------------------------------------------------------
+# Benchmarks (back.* is imported only after the environment points at the mock)
+# ---------------------------------------------------------------------
+def build_benches(server: MockServer) -> List[Bench]:
+    from back import config
+    from back.adapters import rss_adapter
+    from back.adapters.events.aca import parse_aca_html
+    from back.supabase_writer import write_to_supabase
+
+    # every feed is served from its recorded fixture
+    config.RSS_FEEDS[:] = [
+        {"name": f["name"], "url": f"{server.url}/rss/{feed_slug(f)}.xml"} for f in list(config.RSS_FEEDS)
+    ]
+    with open(PREVIEW_JSON, encoding="utf-8") as f:
+        titles = [it["Title"] for it in json.load(f)]
+
+    def news():
+        return len(rss_adapter.get_news_from_rss(days_limit=36500))
+
+    def title_match():
+        for t in titles:
+            rss_adapter._title_matches_and_keywords(t)
+        return len(titles)
+
+    def regions_cold():
+        rss_adapter._REGION_ENGINE._lookup.cache_clear()
+        for t in titles:
+            rss_adapter._extract_regions_from_title(t)
+        return len(titles)
+
+    benches = [
+        Bench("rss.get_news_from_rss", news, repeat=20),
+        Bench("rss.title_match", title_match, repeat=200, unit="titles"),
+        Bench("rss.regions_cold", regions_cold, repeat=200, unit="titles"),
+    ]
+
+    for label, path in ACA_HTML:
+        if not os.path.isfile(path):
+            print(f"[BENCH] skipping aca.parse.{label.lower()}: {path} missing")
+            continue
+        benches.append(Bench(f"aca.parse.{label.lower()}", _aca_parse(parse_aca_html, read_text(path), label),
+                             repeat=5, unit="pages"))
+
+    # 1,000 distinct rows built from the fixture articles
+    base = rss_adapter.get_news_from_rss(days_limit=36500)
+    rows = [replace(base[i % len(base)], link=f"{base[i % len(base)].link}?bench={i}")
+            for i in range(1000)] if base else []
+
+    def write():
+        written, errs, _ = write_to_supabase(rows)
+        if errs:
+            raise RuntimeError(errs[0])
+        return written
+
+    if rows:
+        benches.append(Bench("supabase.write", write, repeat=10, unit="rows"))
+    return benches
+
+
+def _aca_parse(parse, html: str, region: str) -> Callable[[], int]:
+    def run():
+        parse(html, region)
+        return 1
+    return run
+
+
+# ---------------------------------------------------------------------
+# Baseline compare / report
+# ---------------------------------------------------------------------
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    regressions = []
+    for name, r in results.items():
+        b = baseline.get(name)
+        if not b:
+            continue
+        for metric, bigger_better, gated in _METRICS:
+            old, new = b.get(metric), r.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            r.setdefault("delta", {})[metric] = round(ratio - 1, 3)
+            worse = ratio < 1 / (1 + tolerance) if bigger_better else ratio > 1 + tolerance
+            if worse and gated:
+                regressions.append(f"{name}: {metric} {old} -> {new} ({(ratio - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def report(results: Dict[str, Dict]) -> None:
+    print(f"{'benchmark':28} {'p50 ms':>10} {'p99 ms':>10} {'throughput':>16} {'peak KB':>10}  vs baseline")
+    for name, r in results.items():
+        d = r.get("delta", {})
+        vs = " ".join(f"{k.split('_')[0]} {v * 100:+.0f}%" for k, v in d.items()) or "-"
+        thr = f"{r['throughput']:.0f} {r['unit']}/s"
+        print(f"{name:28} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} {thr:>16} {r['peak_kb']:>10.0f}  {vs}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m back.benchmarks", description=__doc__)
+    ap.add_argument("--only", help="comma-separated name prefixes, e.g. rss,aca")
+    ap.add_argument("--repeat", type=int, help="override the per-benchmark run count")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    ap.add_argument("--check", action="store_true", help="exit 1 if anything regressed")
+    ap.add_argument("--json", help="also write the results to this file")
+    args = ap.parse_args(argv)
+
+    server = MockServer().start()
+    os.environ.update({
+        "SUPABASE_URL": server.url,
+        "SUPABASE_SERVICE_KEY": "bench",
+        "CACHE_DIR": tempfile.mkdtemp(prefix="engie-bench-"),
+        "RSS_HTTP_CACHE": "false",          # measure full downloads + parses every run
+        "INCREMENTAL_REFRESH": "false",
+        "GNEWS_RESOLVE": "false",           # fixture GNews links would go to the network
+    })
+    logging.getLogger().setLevel(logging.ERROR)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            benches = build_benches(server)
+        prefixes = [p.strip() for p in (args.only or "").split(",") if p.strip()]
+        results: Dict[str, Dict] = {}
+        for b in benches:
+            if prefixes and not any(b.name.startswith(p) for p in prefixes):
+                continue
+            print(f"[BENCH] {b.name} ...", file=sys.stderr)
+            with contextlib.redirect_stdout(io.StringIO()):   # pipeline logging is noisy
+                results[b.name] = measure(b, args.repeat)
+    finally:
+        server.stop()
+
+    baseline = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        merged = {**baseline, **{k: {m: v for m, v in r.items() if m != "delta"} for k, r in results.items()}}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"[BENCH] baseline saved -> {args.baseline}")
+    elif regressions:
+        print("\nRegressions (> {:.0f}% worse than baseline):".format(args.tolerance * 100))
+        for r in regressions:
+            print("  " + r)
+    elif baseline:
+        print("\nNo regressions against baseline.")
+
+    return 1 if (args.check and regressions and not args.save_baseline) else 0
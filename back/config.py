@@ -17,6 +17,12 @@ def _get_int(name: str, default: int) -> int:
     except Exception:
         return default
 
+def _get_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "").strip())
+    except Exception:
+        return default
+
 def _csv(name: str, default: List[str]) -> List[str]:
     raw = os.getenv(name)
     if not raw:
@@ -26,11 +32,92 @@ def _csv(name: str, default: List[str]) -> List[str]:
 # ============ GLOBAL ============
 DAYS_LIMIT = _get_int("DAYS_LIMIT", 7)   # keep only recent N days
 
+# Local on-disk state (HTTP validators, indexes); safe to delete at any time
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_cache"))
+
 # ============ SUPABASE ============
 SUPABASE_URL         = os.getenv("SUPABASE_URL", "")          # e.g. https://xxxx.supabase.co
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")  # service_role key (backend only)
 SUPABASE_TABLE       = os.getenv("SUPABASE_TABLE", "news")
-USE_SUPABASE         = _get_bool("USE_SUPABASE", True)        # flip to False to fall back to Airtable
+SUPABASE_MAX_ROWS    = _get_int("SUPABASE_MAX_ROWS", 1000)      # PostgREST db-max-rows: rows per response cap
+USE_SUPABASE         = _get_bool("USE_SUPABASE", True)        # False = local SQLite backend (see STORAGE)
+
+# Shared keep-alive HTTP client for the REST endpoint (see supabase_http.py)
+SUPABASE_POOL_SIZE     = _get_int("SUPABASE_POOL_SIZE", 10)         # max pooled connections
+SUPABASE_MAX_RETRIES   = _get_int("SUPABASE_MAX_RETRIES", 3)        # on 429 / 5xx / connection errors
+SUPABASE_RETRY_BACKOFF = _get_float("SUPABASE_RETRY_BACKOFF", 0.5)  # seconds, exponential
+SUPABASE_GZIP_REQUESTS = _get_bool("SUPABASE_GZIP_REQUESTS", False) # gzip JSON bodies (gateway must accept it)
+SUPABASE_GZIP_MIN_BYTES = _get_int("SUPABASE_GZIP_MIN_BYTES", 1024)
+
+# Article upserts: parallel chunks whose size adapts to observed latency / 413s
+SUPABASE_WRITE_WORKERS    = _get_int("SUPABASE_WRITE_WORKERS", 4)       # chunks in flight
+SUPABASE_CHUNK_SIZE       = _get_int("SUPABASE_CHUNK_SIZE", 200)        # starting rows per chunk
+SUPABASE_CHUNK_MIN        = _get_int("SUPABASE_CHUNK_MIN", 25)
+SUPABASE_CHUNK_MAX        = _get_int("SUPABASE_CHUNK_MAX", 1000)
+SUPABASE_CHUNK_TARGET_MS  = _get_int("SUPABASE_CHUNK_TARGET_MS", 2000)  # aim for this latency per chunk
+SUPABASE_RETURN_MINIMAL   = _get_bool("SUPABASE_RETURN_MINIMAL", False) # count via Content-Range, no row echo
+
+# ============ STORAGE ============
+# "supabase" (hosted) or "sqlite" (embedded file in CACHE_DIR, no network/credentials needed)
+STORAGE_BACKEND   = os.getenv("STORAGE_BACKEND", "supabase" if USE_SUPABASE else "sqlite").strip().lower()
+LOCAL_DB          = os.getenv("LOCAL_DB", "engie.sqlite3")      # relative names live in CACHE_DIR
+LOCAL_WRITE_CHUNK = _get_int("LOCAL_WRITE_CHUNK", 500)          # rows per upsert transaction
+
+# ============ API ============
+# GET /articles response cache (seconds); TTL 0 disables. Stale entries are served
+# while a background refresh runs; /refresh invalidates.
+ARTICLES_CACHE_TTL   = _get_int("ARTICLES_CACHE_TTL", 30)
+ARTICLES_CACHE_STALE = _get_int("ARTICLES_CACHE_STALE", 300)
+# GET /articles page size: default stays at 1000 for the current (non-paginating) frontend;
+# clients follow the X-Next-Cursor header for further pages. On Supabase a page holds at
+# most SUPABASE_MAX_ROWS rows (a full capped page always carries a cursor).
+ARTICLES_PAGE_SIZE = _get_int("ARTICLES_PAGE_SIZE", 1000)
+ARTICLES_PAGE_MAX  = _get_int("ARTICLES_PAGE_MAX", 1000)
+# GET /events cache: keyed by today's date (rolls over at midnight); /refresh/events
+# invalidates, so the TTL only bounds how long edits made outside this process take to show.
+EVENTS_CACHE_TTL   = _get_int("EVENTS_CACHE_TTL", 3600)
+EVENTS_CACHE_STALE = _get_int("EVENTS_CACHE_STALE", 600)
+# Default GET /events window: days ahead (0 = every upcoming event) and row cap (0 = none)
+EVENTS_HORIZON_DAYS = _get_int("EVENTS_HORIZON_DAYS", 0)
+EVENTS_READ_LIMIT   = _get_int("EVENTS_READ_LIMIT", 0)
+
+# ============ SEARCH ============
+# GET /search: SQLite FTS5 index in CACHE_DIR, fed by the article writer.
+# An empty index is back-filled from the storage backend once at startup (SEARCH_BACKFILL).
+# Kept apart from LOCAL_DB even on the sqlite backend: it is a rebuildable cache.
+SEARCH_ENABLED   = _get_bool("SEARCH_ENABLED", True)
+SEARCH_DB        = os.getenv("SEARCH_DB", "search_index.sqlite3")
+SEARCH_BACKFILL  = _get_bool("SEARCH_BACKFILL", True)
+SEARCH_LIMIT_MAX = _get_int("SEARCH_LIMIT_MAX", 100)
+
+# ============ METRICS ============
+METRICS_ENABLED      = _get_bool("METRICS_ENABLED", True)       # GET /metrics (Prometheus text format)
+SERVER_TIMING_HEADER = _get_bool("SERVER_TIMING_HEADER", True)  # per-request stage timings header
+
+# ============ SCHEDULER ============
+# Periodic refresh intervals in seconds (0 = only on POST /refresh*). Each tick is
+# spread by +/- REFRESH_JITTER; concurrent triggers join the run already in flight.
+NEWS_REFRESH_INTERVAL   = _get_int("NEWS_REFRESH_INTERVAL", 0)
+EVENTS_REFRESH_INTERVAL = _get_int("EVENTS_REFRESH_INTERVAL", 0)
+REFRESH_JITTER          = _get_float("REFRESH_JITTER", 0.1)
+REFRESH_HISTORY_SIZE    = _get_int("REFRESH_HISTORY_SIZE", 50)
+
+# ============ EVENTS ============
+# Pages scraped concurrently in the shared Chromium (browser stays up between refreshes)
+EVENTS_BROWSER_PAGES = _get_int("EVENTS_BROWSER_PAGES", 4)
+EVENTS_PAGE_TIMEOUT_MS = _get_int("EVENTS_PAGE_TIMEOUT_MS", 30000)
+# Request interception in the browser: resource types to abort, and third-party hosts
+# (anything off the page's own site, except EVENTS_ALLOW_HOSTS, e.g. script CDNs)
+EVENTS_BLOCK_RESOURCES   = _csv("EVENTS_BLOCK_RESOURCES", ["image", "media", "font", "stylesheet"])
+EVENTS_BLOCK_THIRD_PARTY = _get_bool("EVENTS_BLOCK_THIRD_PARTY", True)
+EVENTS_ALLOW_HOSTS       = _csv("EVENTS_ALLOW_HOSTS", [
+    "code.jquery.com", "ajax.googleapis.com", "cdnjs.cloudflare.com", "cdn.jsdelivr.net",
+])
+# Try the static (requests + BeautifulSoup) scraper first; only render in Chromium
+# the sources where it finds no rows
+EVENTS_STATIC_FIRST = _get_bool("EVENTS_STATIC_FIRST", True)
+# Save each statically fetched ACA page to CACHE_DIR/aca_<region>.html (debugging only)
+EVENTS_SAVE_HTML    = _get_bool("EVENTS_SAVE_HTML", False)
 
 # ============ RSS ============
 RSS_ENABLED   = _get_bool("RSS_ENABLED", True)
@@ -49,6 +136,43 @@ RSS_FEEDS = [
      "url": "https://news.google.com/rss/search?q=site:reuters.com+energy+OR+climate+OR+renewable&hl=en-SG&gl=SG&ceid=SG:en"},
 ]
 
+# Concurrent fetch stage (see adapters/feed_fetcher.py)
+RSS_FETCH_WORKERS  = _get_int("RSS_FETCH_WORKERS", 32)    # max concurrent feed connections
+RSS_FEED_TIMEOUT   = _get_int("RSS_FEED_TIMEOUT", 15)     # seconds, per feed (download + parse)
+RSS_FETCH_DEADLINE = _get_int("RSS_FETCH_DEADLINE", 45)   # seconds, for the whole fetch stage
+RSS_HTTP_CACHE     = _get_bool("RSS_HTTP_CACHE", True)    # ETag/Last-Modified conditional GETs
+RSS_STREAM_PARSE   = _get_bool("RSS_STREAM_PARSE", True)  # incremental parse, stops at RSS_MAX_ITEMS
+
+# Expand news.google.com redirect links to the publisher URL (cached in CACHE_DIR)
+GNEWS_RESOLVE                = _get_bool("GNEWS_RESOLVE", False)   # HTTP step scrapes undocumented Google endpoints
+GNEWS_RESOLVE_WORKERS        = _get_int("GNEWS_RESOLVE_WORKERS", 8)
+GNEWS_RESOLVE_RPS            = _get_float("GNEWS_RESOLVE_RPS", 5.0)    # per host
+GNEWS_RESOLVE_TIMEOUT        = _get_int("GNEWS_RESOLVE_TIMEOUT", 10)   # seconds, per link
+GNEWS_RESOLVE_DEADLINE       = _get_int("GNEWS_RESOLVE_DEADLINE", 30)  # seconds, whole stage
+GNEWS_RESOLVE_TTL_DAYS       = _get_int("GNEWS_RESOLVE_TTL_DAYS", 30)
+GNEWS_RESOLVE_FAIL_TTL_HOURS = _get_int("GNEWS_RESOLVE_FAIL_TTL_HOURS", 6)
+
+# Incremental refresh: skip links already written + entries older than each feed's watermark.
+# POST /refresh?full=true bypasses it for a full resync.
+INCREMENTAL_REFRESH = _get_bool("INCREMENTAL_REFRESH", True)
+SEEN_RETENTION_DAYS = _get_int("SEEN_RETENTION_DAYS", 30)  # forget written links older than this
+
+# Near-duplicate titles (same story via GNews + the publisher's feed): MinHash LSH over
+# normalized title words; word-set Jaccard >= NEAR_DUP_THRESHOLD = same story
+NEAR_DUP_ENABLED    = _get_bool("NEAR_DUP_ENABLED", True)
+NEAR_DUP_THRESHOLD  = _get_float("NEAR_DUP_THRESHOLD", 0.7)
+NEAR_DUP_MIN_TOKENS = _get_int("NEAR_DUP_MIN_TOKENS", 4)   # shorter titles are never merged
+
+# Streaming refresh: items flow fetch -> filter -> dedupe -> upsert and each chunk is
+# written as soon as it fills (POST /refresh?stream=true overrides per call)
+REFRESH_STREAMING = _get_bool("REFRESH_STREAMING", False)
+
+# Region inference: memoized title lookups (see adapters/region_engine.py)
+REGION_CACHE_SIZE = _get_int("REGION_CACHE_SIZE", 4096)
+
+# Feed timestamps: memoized string -> (datetime, ISO) parses (see dates.py)
+DATE_CACHE_SIZE = _get_int("DATE_CACHE_SIZE", 8192)
+
 # ============ Keyword rules (used by rss_adapter / filters) ============
 ANY_KEYWORDS = _csv("ANY_KEYWORDS", [
     "engie", "energy", "carbon", "regulation", "policy",
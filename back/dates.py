@@ -0,0 +1,189 @@
+# back/dates.py
+"""
+Date parsing shared by the news and events pipelines.
+
+News timestamps (feed entries): parse_timestamp() takes feedparser's
+struct_time or the raw string and returns a Timestamp, the aware UTC
+datetime together with its ISO string ('2025-10-17T08:30:00+00:00'), so
+the adapter compares and stores the same value without re-parsing it.
+Strings try precompiled fast paths first (RFC 822, as in <pubDate>; ISO
+8601, as in Atom and dc:date); only other shapes reach dateutil. Results
+are memoized: Google News repeats the same pubDate across many entries
+and across refreshes.
+
+Event dates (scraped tables): one MONTHS table, day_month() for
+'02 Nov' cells and parse_date_range() for 'OCT 20-21 [2025]'.
+"""
+from __future__ import annotations
+
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from dateutil import parser as dtparser
+
+from .config import DATE_CACHE_SIZE
+
+__all__ = [
+    "MONTHS", "Timestamp", "parse_timestamp", "now_timestamp",
+    "day_month", "iso_date", "parse_date_range",
+]
+
+MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "SEPT": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+
+
+class Timestamp(NamedTuple):
+    dt: datetime    # aware, UTC, whole seconds
+    iso: str        # dt.isoformat()
+
+
+def _stamp(d: datetime) -> Timestamp:
+    if d.tzinfo is None:
+        d = d.replace(tzinfo=timezone.utc)
+    d = d.astimezone(timezone.utc).replace(microsecond=0)
+    return Timestamp(d, d.isoformat())
+
+
+def now_timestamp() -> Timestamp:
+    return _stamp(datetime.now(timezone.utc))
+
+
+# ---------------------------------------------------------------------
+# News: feed timestamps
+# ---------------------------------------------------------------------
+# 'Fri, 17 Oct 2025 08:30:00 GMT' / '17 Oct 2025 08:30 +0200'
+_RFC822 = re.compile(
+    r"(?:[A-Za-z]{3},?\s+)?(\d{1,2})\s+([A-Za-z]{3,4})\.?\s+(\d{4})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([A-Za-z]{1,3}|[+-]\d{2}:?\d{2})?"
+)
+# zone names RFC 822 defines (the ones email.utils / feedparser understand), in hours
+_ZONES = {
+    "GMT": 0, "UT": 0, "UTC": 0, "Z": 0,
+    "EST": -5, "EDT": -4, "CST": -6, "CDT": -5, "MST": -7, "MDT": -6, "PST": -8, "PDT": -7,
+}
+_ISO = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _rfc822(s: str) -> Optional[datetime]:
+    m = _RFC822.fullmatch(s)
+    if not m:
+        return None
+    mon = MONTHS.get(m.group(2).upper())
+    zone = m.group(7)
+    if not mon:
+        return None
+    if zone is None:
+        tz = timezone.utc
+    elif zone[0] in "+-":
+        z = zone.replace(":", "")
+        mins = int(z[1:3]) * 60 + int(z[3:5])
+        tz = timezone(timedelta(minutes=-mins if z[0] == "-" else mins))
+    elif zone.upper() in _ZONES:
+        tz = timezone(timedelta(hours=_ZONES[zone.upper()]))
+    else:
+        return None     # military / unknown zone letters: leave it to dateutil
+    try:
+        return datetime(int(m.group(3)), mon, int(m.group(1)), int(m.group(4)),
+                        int(m.group(5)), int(m.group(6) or 0), tzinfo=tz)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_str(s: str) -> Optional[Timestamp]:
+    d = _rfc822(s)
+    if d is None and _ISO.match(s):
+        try:
+            d = datetime.fromisoformat(s)   # 3.11: 'Z', offsets, fractional seconds
+        except ValueError:
+            d = None
+    if d is None:
+        try:
+            d = dtparser.parse(s)
+        except (ValueError, OverflowError):
+            return None
+    return _stamp(d)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_fields(fields: Tuple[int, ...]) -> Optional[Timestamp]:
+    try:
+        return _stamp(datetime(*fields, tzinfo=timezone.utc))
+    except ValueError:
+        return None
+
+
+def parse_timestamp(value) -> Optional[Timestamp]:
+    """
+    struct_time (UTC, as feedparser returns it) or a date string -> Timestamp,
+    or None when it can't be parsed. Naive values are taken as UTC.
+    """
+    if isinstance(value, time.struct_time) or hasattr(value, "tm_year"):
+        return _parse_fields(tuple(value[:6]))
+    if isinstance(value, str) and value.strip():
+        return _parse_str(value.strip())
+    return None
+
+
+# ---------------------------------------------------------------------
+# Events: scraped calendar cells
+# ---------------------------------------------------------------------
+_DAY_MON = re.compile(r"(?P<d>\d{1,2})\s+(?P<mon>[A-Z]{3,4})")
+_RANGE = re.compile(r"^(?P<mon>[A-Z]{3,4})\s+(?P<d1>\d{1,2})(?:\s*-\s*(?P<d2>\d{1,2}))?(?:[, ]+(?P<y>\d{4}))?$")
+
+
+@lru_cache(maxsize=1024)
+def day_month(text: str, whole: bool = False) -> Optional[Tuple[int, int]]:
+    """
+    '02 Nov' / '2 NOV.' -> (day, month). whole=True rejects trailing text
+    ('02 Nov 2025'); otherwise only the leading 'DD Mon' is read.
+    """
+    s = " ".join((text or "").upper().replace(".", "").split())
+    m = _DAY_MON.fullmatch(s) if whole else _DAY_MON.match(s)
+    if not m:
+        return None
+    mon = MONTHS.get(m.group("mon"))
+    return (int(m.group("d")), mon) if mon else None
+
+
+def iso_date(year: int, month: int, day: int) -> Optional[str]:
+    """'YYYY-MM-DD', or None for an impossible date (e.g. 31 Nov)."""
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _date_range(s: str, year: int) -> Tuple[Optional[str], Optional[str]]:
+    m = _RANGE.match(s)
+    if not m:
+        return (None, None)
+    mon = MONTHS.get(m.group("mon"))
+    if not mon:
+        return (None, None)
+    y = int(m.group("y")) if m.group("y") else year
+    d2 = int(m.group("d2")) if m.group("d2") else None
+    start = iso_date(y, mon, int(m.group("d1")))
+    end = iso_date(y, mon, d2) if d2 else None
+    if start is None or (d2 and end is None):
+        return (None, None)
+    return (start, end)
+
+
+def parse_date_range(date_raw: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Accepts strings like:
+      'OCT 20–21', 'OCT 20-21', 'OCT 13, 2025', 'DEC 9-10 2026'
+    Returns ISO dates: ('YYYY-MM-DD', 'YYYY-MM-DD|None')
+    If parsing fails, returns (None, None). A missing year means this year.
+    """
+    if not date_raw:
+        return (None, None)
+    s = date_raw.strip().upper().replace("–", "-").replace("—", "-")
+    return _date_range(s, datetime.now().year)
@@ -1,23 +1,33 @@
 # back/events_ingest.py
 from __future__ import annotations
-from typing import Dict, List
+import asyncio
+from typing import Dict, List, Optional
 
-from back.adapters.events.aca_playwright import fetch_allconferencealert_events
-from back.supabase_events import upsert_events
+from back.adapters.events.aca_playwright import afetch_allconferencealert_events
+from back.adapters.events.browser_pool import BrowserPool
+from back.metrics import timed
+from back.models import Event
+from back.config import STORAGE_BACKEND
+if STORAGE_BACKEND == "sqlite":
+    from back.local_store import upsert_events
+else:
+    from back.supabase_events import upsert_events
 
 
-def run_events_ingest() -> Dict:
+@timed("events.ingest")
+async def arun_events_ingest(pool: Optional[BrowserPool] = None) -> Dict:
     """
     Scrape AllConferenceAlert (JS-rendered via Playwright) for SG/MY/PH energy events,
     normalize them into (title, region, city, venue, starts_on, ends_on, link, source),
     then upsert into Supabase (public.events).
+    `pool` defaults to the shared browser pool; the upsert runs in a thread.
     """
     # 1) Fetch & normalize (already normalized by the fetcher)
-    rows: List[Dict] = fetch_allconferencealert_events()
+    rows: List[Event] = await afetch_allconferencealert_events(pool=pool)
     raw_count = len(rows)
 
     # 2) Upsert to Supabase
-    inserted, skipped = upsert_events(rows)
+    inserted, skipped = await asyncio.to_thread(upsert_events, rows)
 
     return {
         "raw": raw_count,
@@ -25,3 +35,14 @@ def run_events_ingest() -> Dict:
         "upserted": inserted,
         "skipped": skipped,
     }
+
+
+def run_events_ingest() -> Dict:
+    """Blocking wrapper (CLI / scripts): private browser, closed afterwards."""
+    async def run():
+        pool = BrowserPool()
+        try:
+            return await arun_events_ingest(pool=pool)
+        finally:
+            await pool.close()
+    return asyncio.run(run())
@@ -1,28 +1,68 @@
 # back/fetch_news.py (RSS-only)
-from typing import List
-from .config import DAYS_LIMIT, RSS_ENABLED
-from .adapters.rss_adapter import get_news_from_rss
-
-def fetch_filtered_news(days_limit: int = DAYS_LIMIT) -> List[dict]:
-    """
-    Fetch news items using RSS only, respecting days_limit.
-    Returns a list of normalized article dicts that downstream writer expects.
-    """
-    items: List[dict] = []
-
-    if RSS_ENABLED:
-        rss_items = get_news_from_rss(days_limit=days_limit)
-        if rss_items:
-            items.extend(rss_items)
+import asyncio
+from typing import AsyncIterator, Iterable, Iterator, List
+from .config import DAYS_LIMIT, RSS_ENABLED, INCREMENTAL_REFRESH, NEAR_DUP_ENABLED
+from .metrics import RSS_ITEMS, timed
+from .models import Article
+from .near_dupes import get_near_dup_index
+from .adapters.rss_adapter import aget_news_from_rss, aiter_news_from_rss
 
+def _dedupe_by_link(items: Iterable[Article]) -> Iterator[Article]:
     # De-duplicate by Link (case-insensitive)
     seen = set()
-    deduped = []
     for it in items:
-        link = (it.get("Link") or "").strip()
+        link = (it.link or "").strip()
         key = link.lower()
         if key and key not in seen:
             seen.add(key)
-            deduped.append(it)
+            yield it
+
+def _near_dup_dropped(it: Article, canonical: str) -> None:
+    RSS_ITEMS.inc(outcome="near_duplicate")
+    print(f"[DEDUP] near-duplicate of {canonical}: {it.title[:80]!r}")
+
+def _drop_near_duplicates(items: Iterable[Article]) -> Iterable[Article]:
+    # Same story under a different URL (GNews vs publisher feed, reworded titles)
+    if not NEAR_DUP_ENABLED:
+        return items
+    return get_near_dup_index().filter(items, on_drop=_near_dup_dropped)
+
+@timed("news.fetch_filtered")
+async def afetch_filtered_news(days_limit: int = DAYS_LIMIT, incremental: bool = INCREMENTAL_REFRESH) -> List[Article]:
+    """
+    Fetch news items using RSS only, respecting days_limit.
+    Returns a list of Article records that the downstream writer expects.
+    With `incremental`, only items not yet written by an earlier refresh are returned
+    (pass incremental=False for a full resync).
+    """
+    if not RSS_ENABLED:
+        return []
+    items = await aget_news_from_rss(days_limit=days_limit, incremental=incremental)
+    return list(_drop_near_duplicates(_dedupe_by_link(items or [])))
+
+async def aiter_filtered_news(days_limit: int = DAYS_LIMIT, incremental: bool = INCREMENTAL_REFRESH) -> AsyncIterator[Article]:
+    """
+    Streaming counterpart of afetch_filtered_news: fetch -> filter -> enrich -> dedupe
+    as an async generator, yielding each item as soon as its feed is ready.
+    Feed it straight into awrite_to_supabase to upsert chunk by chunk.
+    """
+    if not RSS_ENABLED:
+        return
+    seen = set()
+    index = get_near_dup_index() if NEAR_DUP_ENABLED else None
+    batch = index.new_batch() if index is not None else None
+    async for it in aiter_news_from_rss(days_limit=days_limit, incremental=incremental):
+        key = (it.link or "").strip().lower()
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        if index is not None:
+            canonical = index.check(it, batch)
+            if canonical is not None:
+                _near_dup_dropped(it, canonical)
+                continue
+        yield it
 
-    return deduped
+def fetch_filtered_news(days_limit: int = DAYS_LIMIT, incremental: bool = INCREMENTAL_REFRESH) -> List[Article]:
+    """Blocking wrapper (CLI / scripts) around afetch_filtered_news."""
+    return asyncio.run(afetch_filtered_news(days_limit=days_limit, incremental=incremental))
@@ -0,0 +1,104 @@
+# back/jobs.py
+"""
+Background jobs for long-running ETL (news / events refresh).
+
+Jobs run as asyncio tasks on the API's event loop; blocking pieces inside
+them are pushed to worker threads, so a refresh never holds a request
+worker. Finished jobs are kept (bounded) so GET /jobs/{id} can report them.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+__all__ = ["Job", "JobRegistry"]
+
+
+class Job:
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.status = "queued"          # queued | running | succeeded | failed
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self.exception: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = None
+        if self.started_at is not None:
+            duration = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_s": duration,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobRegistry:
+    def __init__(self, max_jobs: int = 100):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(self, name: str, fn: Callable[[], Awaitable[Any]], after: Optional[Job] = None) -> Job:
+        """
+        Start `fn()` as a background task on the running loop and track it.
+        With `after`, the job stays queued until that job has finished.
+        """
+        job = Job(name)
+        job.task = asyncio.ensure_future(self._run(job, fn, after))
+        self._jobs[job.id] = job
+        self._trim()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, name: Optional[str] = None) -> list:
+        return [j.to_dict() for j in reversed(self._jobs.values()) if name is None or j.name == name]
+
+    async def wait(self, job: Job) -> Any:
+        """Await a job and return its result (re-raises its exception)."""
+        await asyncio.shield(job.task)
+        if job.exception is not None:
+            raise job.exception
+        return job.result
+
+    async def _run(self, job: Job, fn: Callable[[], Awaitable[Any]], after: Optional[Job] = None) -> None:
+        if after is not None and after.task is not None:
+            await asyncio.wait({after.task})
+        job.status, job.started_at = "running", time.time()
+        try:
+            job.result = await fn()
+            job.status = "succeeded"
+        except Exception as e:
+            # kept on the job (not raised) so un-awaited background jobs don't warn
+            job.exception = e
+            job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+            print(f"❌  Job {job.name}/{job.id} failed: {job.error}")
+        finally:
+            job.finished_at = time.time()
+
+    def _trim(self) -> None:
+        # drop the oldest *finished* jobs beyond the cap; running ones are kept
+        for jid in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[jid].done:
+                del self._jobs[jid]
@@ -0,0 +1,45 @@
+# back/json_store.py
+"""
+Tiny helpers for the JSON files kept under CACHE_DIR.
+Writes are atomic (temp file + rename) so a crash mid-refresh never
+leaves a half-written cache behind.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any
+
+from .config import CACHE_DIR
+
+
+def cache_path(name: str) -> str:
+    return os.path.join(CACHE_DIR, name)
+
+
+def load_json(path: str, default: Any) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        print(f"[CACHE] Ignoring unreadable {path}: {e}")
+        return default
+
+
+def save_json(path: str, data: Any) -> None:
+    d = os.path.dirname(path)
+    os.makedirs(d, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=d)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
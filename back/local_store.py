@@ -0,0 +1,276 @@
+# back/local_store.py
+"""
+Embedded storage backend (SQLite, WAL) with the same contracts as the
+Supabase modules, selected with STORAGE_BACKEND=sqlite (or USE_SUPABASE=false):
+
+  news    get_articles / get_articles_page / aget_articles_page   (supabase_reader)
+          write_articles / awrite_articles                        (supabase_writer)
+  events  upsert_events / fetch_upcoming_events                   (supabase_events)
+
+Tables mirror the hosted schema: news is unique on link and ordered by
+(published desc, id desc) with the same keyset cursors; events are unique on
+the title + region + starts_on dedupe key. Writes are batched upserts, one
+transaction per LOCAL_WRITE_CHUNK rows. One connection serves every thread
+(WAL keeps readers of the file from other processes unblocked).
+
+Runs without network or credentials, so it also backs offline runs of the
+API, tests and the benchmarks.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import LOCAL_DB, LOCAL_WRITE_CHUNK
+from .json_store import cache_path
+from .metrics import ROWS_WRITTEN, timed
+from .models import Article, Event
+from .supabase_reader import decode_cursor, encode_cursor
+from .write_run import UpsertRun, abatch, article_row
+
+__all__ = [
+    "LocalStore", "get_local_store",
+    "get_articles", "get_articles_page", "aget_articles_page", "write_articles", "awrite_articles",
+    "upsert_events", "fetch_upcoming_events",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    id          INTEGER PRIMARY KEY,
+    link        TEXT NOT NULL UNIQUE,
+    title       TEXT NOT NULL DEFAULT '',
+    source      TEXT,
+    published   TEXT,                       -- YYYY-MM-DD or NULL
+    summary     TEXT,
+    keywords    TEXT,
+    region      TEXT,
+    topic       TEXT NOT NULL DEFAULT '[]', -- JSON array
+    inserted_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
+    updated_at  TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS news_published ON news(published DESC, id DESC);
+CREATE INDEX IF NOT EXISTS news_region ON news(region, published DESC);
+
+CREATE TABLE IF NOT EXISTS events (
+    id          INTEGER PRIMARY KEY,
+    title       TEXT NOT NULL,
+    region      TEXT,
+    city        TEXT,
+    venue       TEXT,
+    starts_on   TEXT NOT NULL,              -- YYYY-MM-DD
+    ends_on     TEXT,
+    link        TEXT,
+    source      TEXT,
+    dedupe_key  TEXT NOT NULL UNIQUE,
+    inserted_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS events_starts_on ON events(starts_on);
+"""
+
+_NEWS_UPSERT = """
+INSERT INTO news (link, title, source, published, summary, keywords, region, topic)
+VALUES (:link, :title, :source, :published, :summary, :keywords, :region, :topic)
+ON CONFLICT(link) DO UPDATE SET
+    title = excluded.title, source = excluded.source, published = excluded.published,
+    summary = excluded.summary, keywords = excluded.keywords, region = excluded.region,
+    topic = excluded.topic, updated_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now')
+"""
+
+_EVENT_INSERT = """
+INSERT INTO events (title, region, city, venue, starts_on, ends_on, link, source, dedupe_key)
+VALUES (:title, :region, :city, :venue, :starts_on, :ends_on, :link, :source, :dedupe_key)
+ON CONFLICT(dedupe_key) DO NOTHING
+"""
+
+_NEWS_COLUMNS = "id, title, link, source, published, summary, keywords, region, topic, inserted_at, updated_at"
+_EVENT_COLUMNS = "id, title, region, city, venue, starts_on, ends_on, link, source"
+
+
+class LocalStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")   # durable at checkpoints; fine for a cache-like store
+            self._db.executescript(_SCHEMA)
+
+    # ---------- news ----------
+    def upsert_news(self, rows: List[dict]) -> int:
+        """Upsert payload rows (write_run.article_row output) in one transaction."""
+        params = [{
+            "link": r.get("link") or "",
+            "title": r.get("title") or "",
+            "source": r.get("source") or None,
+            "published": r.get("published") or None,
+            "summary": r.get("summary") or None,
+            "keywords": r.get("keywords") or None,
+            "region": r.get("region") or None,
+            "topic": json.dumps(r.get("topic") or [], ensure_ascii=False),
+        } for r in rows if r.get("link")]
+        if not params:
+            return 0
+        with self._lock, self._db:
+            self._db.executemany(_NEWS_UPSERT, params)
+        return len(params)
+
+    def news_page(self, limit: int, cursor: Optional[str] = None, region: Optional[str] = None,
+                  topic: Optional[str] = None, source: Optional[str] = None,
+                  since: Optional[str] = None, until: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        where, args = [], []
+        if cursor:
+            published, rid = decode_cursor(cursor)
+            if published is None:
+                where.append("published IS NULL AND id < ?")
+                args.append(int(rid))
+            else:
+                where.append("(published < ? OR (published = ? AND id < ?) OR published IS NULL)")
+                args += [published, published, int(rid)]
+        if region:
+            where.append("region = ?")
+            args.append(region)
+        if source:
+            where.append("source = ?")
+            args.append(source)
+        if topic:
+            where.append("EXISTS (SELECT 1 FROM json_each(news.topic) WHERE value = ?)")
+            args.append(topic)
+        if since:
+            where.append("published >= ?")
+            args.append(since)
+        if until:
+            where.append("published <= ?")
+            args.append(until)
+        sql = f"SELECT {_NEWS_COLUMNS} FROM news"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY published DESC NULLS LAST, id DESC LIMIT ?"
+        args.append(limit + 1)   # one extra row tells us whether another page exists
+        with self._lock:
+            rows = [dict(r) for r in self._db.execute(sql, args).fetchall()]
+        for r in rows:
+            r["topic"] = json.loads(r["topic"] or "[]")
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return [Article.from_row(r).to_frontend() for r in rows[:limit]], next_cursor
+
+    # ---------- events ----------
+    def insert_events(self, rows: List[dict]) -> int:
+        if not rows:
+            return 0
+        with self._lock, self._db:
+            return self._db.executemany(_EVENT_INSERT, rows).rowcount
+
+    def upcoming_events(self, today: date, horizon_days: Optional[int], limit: Optional[int]) -> List[Dict]:
+        sql, args = f"SELECT {_EVENT_COLUMNS} FROM events WHERE starts_on >= ?", [today.isoformat()]
+        if horizon_days:
+            sql += " AND starts_on <= ?"
+            args.append((today + timedelta(days=horizon_days)).isoformat())
+        sql += " ORDER BY starts_on ASC, id ASC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            return [dict(r) for r in self._db.execute(sql, args).fetchall()]
+
+
+_STORE: Optional[LocalStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_local_store() -> LocalStore:
+    """Process-wide store, opened lazily from CACHE_DIR (LOCAL_DB)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = LocalStore(LOCAL_DB if os.path.isabs(LOCAL_DB) else cache_path(LOCAL_DB))
+        return _STORE
+
+
+# ---------------------------------------------------------------------
+# News contracts (same signatures / return shapes as the Supabase modules)
+# ---------------------------------------------------------------------
+@timed("articles.read")
+def get_articles_page(limit: int = 1000, cursor: Optional[str] = None,
+                      region: Optional[str] = None, topic: Optional[str] = None,
+                      source: Optional[str] = None, since: Optional[str] = None,
+                      until: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """Local get_articles_page: (articles, next_cursor). Raises ValueError on a malformed cursor."""
+    return get_local_store().news_page(limit, cursor, region, topic, source, since, until)
+
+
+async def aget_articles_page(limit: int = 1000, cursor: Optional[str] = None, **filters) -> Tuple[list, Optional[str]]:
+    return await asyncio.to_thread(get_articles_page, limit, cursor, **filters)
+
+
+def get_articles() -> list:
+    out, _ = get_articles_page(limit=1000)
+    return out
+
+
+def _write_chunk(run: UpsertRun, batch: list) -> None:
+    ch = [article_row(i) for i in batch]
+    t0 = time.perf_counter()
+    try:
+        n = get_local_store().upsert_news(ch)
+        outcome = (200, n, None, (time.perf_counter() - t0) * 1000)
+    except sqlite3.Error as e:
+        outcome = e
+    # same bookkeeping as the Supabase writer: seen store, near-dup index, search index
+    run.done(batch, ch, outcome)
+
+
+@timed("local.write")
+async def awrite_articles(items, chunk: int = LOCAL_WRITE_CHUNK) -> Tuple[int, List[str], Optional[dict]]:
+    """Local awrite_to_supabase: upsert `items` (list, iterable or async iterable) -> (written, errors, sample)."""
+    run = UpsertRun("news")
+    source = items.__aiter__() if hasattr(items, "__aiter__") else iter(items or ())
+    while True:
+        batch = await abatch(source, chunk)
+        if not batch:
+            break
+        await asyncio.to_thread(_write_chunk, run, batch)
+    return await asyncio.to_thread(run.result)
+
+
+def write_articles(items: Iterable, chunk: int = LOCAL_WRITE_CHUNK) -> Tuple[int, List[str], Optional[dict]]:
+    """Blocking wrapper (CLI / scripts) around awrite_articles."""
+    return asyncio.run(awrite_articles(items, chunk))
+
+
+# ---------------------------------------------------------------------
+# Events contracts
+# ---------------------------------------------------------------------
+@timed("events.upsert")
+def upsert_events(rows: List[Event | Dict]) -> Tuple[int, int]:
+    """Local upsert_events: insert new events, ignore known dedupe keys -> (written, skipped)."""
+    if not rows:
+        return (0, 0)
+    seen, params = set(), []
+    for r in rows:
+        ev = Event.from_item(r)
+        if not ev.title or not ev.starts_on:
+            continue
+        k = ev.dedupe_key()
+        if k in seen:
+            continue
+        seen.add(k)
+        params.append(dict(ev.to_row(), dedupe_key="|".join(k)))
+    written = get_local_store().insert_events(params)
+    ROWS_WRITTEN.inc(written, table="events")
+    return (written, max(0, len(rows) - written))
+
+
+@timed("events.read")
+def fetch_upcoming_events(horizon_days: Optional[int] = None, limit: Optional[int] = None,
+                          today: Optional[date] = None) -> List[Dict]:
+    """Local fetch_upcoming_events: same filters, columns and order as the Supabase reader."""
+    return get_local_store().upcoming_events(today or date.today(), horizon_days, limit)
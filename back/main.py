@@ -2,99 +2,312 @@
 from dotenv import load_dotenv
 load_dotenv()  # finds .env in root by default
 
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from .config import USE_SUPABASE, DAYS_LIMIT
-from .fetch_news import fetch_filtered_news
+from .config import (
+    STORAGE_BACKEND, DAYS_LIMIT, INCREMENTAL_REFRESH, REFRESH_STREAMING,
+    ARTICLES_CACHE_TTL, ARTICLES_CACHE_STALE, ARTICLES_PAGE_SIZE, ARTICLES_PAGE_MAX,
+    EVENTS_CACHE_TTL, EVENTS_CACHE_STALE, EVENTS_HORIZON_DAYS, EVENTS_READ_LIMIT,
+    NEWS_REFRESH_INTERVAL, EVENTS_REFRESH_INTERVAL, REFRESH_JITTER, REFRESH_HISTORY_SIZE,
+    METRICS_ENABLED, SERVER_TIMING_HEADER,
+    SEARCH_ENABLED, SEARCH_BACKFILL, SEARCH_LIMIT_MAX,
+)
+from .fetch_news import afetch_filtered_news, aiter_filtered_news
+from .jobs import JobRegistry
+from . import metrics
+from .response_cache import ResponseCache
+from .scheduler import RefreshScheduler
+from .search_index import get_search_index
 
 # ----- News backend (existing) -----
-if USE_SUPABASE:
-    from .supabase_reader import get_articles
-    from .supabase_writer import write_to_supabase as write_to_backend
+if STORAGE_BACKEND == "sqlite":
+    # embedded file in CACHE_DIR: same contracts, no network
+    from .local_store import aget_articles_page
+    from .local_store import awrite_articles as awrite_to_backend
+    close_async_client = None
+    BACKEND_NAME = "sqlite"
+elif STORAGE_BACKEND == "supabase":
+    from .supabase_reader import aget_articles_page
+    from .supabase_writer import awrite_to_supabase as awrite_to_backend
+    from .supabase_http import close_async_client
     BACKEND_NAME = "supabase"
 else:
-    from .airtable_reader import get_articles
-    from .airtable_writer import write_to_airtable as write_to_backend
-    BACKEND_NAME = "airtable"
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r} (expected 'supabase' or 'sqlite')")
 
 # ----- Events backend (new) -----
 # Stubs you created:
-#   back/events_ingest.py -> run_events_ingest()
-#   back/supabase_events.py -> fetch_upcoming_events()
-from back.events_ingest import run_events_ingest
-from back.supabase_events import fetch_upcoming_events
+#   back/events_ingest.py -> arun_events_ingest()
+#   back/supabase_events.py -> fetch_upcoming_events()  (back/local_store.py on sqlite)
+from back.events_ingest import arun_events_ingest
+from back.adapters.events.browser_pool import close_browser_pool
+if BACKEND_NAME == "sqlite":
+    from back.local_store import fetch_upcoming_events
+else:
+    from back.supabase_events import fetch_upcoming_events
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler.start()
+    if SEARCH_ENABLED and SEARCH_BACKFILL:
+        index = get_search_index()
+        if not len(index):
+            # first run on this CACHE_DIR: index what the backend already holds, in the background
+            jobs.submit("search-backfill", lambda: index.abackfill(aget_articles_page))
+    yield
+    await scheduler.stop()
+    await close_browser_pool()
+    if close_async_client is not None:
+        await close_async_client()
 
-app = FastAPI(title="ENGIE News API (Local)")
+app = FastAPI(title="ENGIE News API (Local)", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],  # Vite dev origin
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
+@app.middleware("http")
+async def instrument(request: Request, call_next):
+    """Request count / latency per route, plus a Server-Timing header with the stages it ran."""
+    token = metrics.begin_request_timings()
+    t0 = time.perf_counter()
+    try:
+        response = await call_next(request)
+        elapsed = time.perf_counter() - t0
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.API_REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+        metrics.API_SECONDS.observe(elapsed, route=route)
+        if SERVER_TIMING_HEADER:
+            response.headers["Server-Timing"] = metrics.server_timing_header(elapsed)
+        return response
+    finally:
+        metrics.end_request_timings(token)
+
+# Long ETL runs execute as background jobs on the event loop (blocking parts in threads).
+# The scheduler coalesces concurrent triggers per pipeline and runs the periodic refreshes.
+jobs = JobRegistry()
+scheduler = RefreshScheduler(jobs, history_size=REFRESH_HISTORY_SIZE)
+
+async def _run_job(name: str, fn, background: bool, params=None):
+    """
+    Trigger pipeline `name` (or join its in-flight run with the same `params`;
+    other params queue behind it); return 202 + job id when `background`,
+    else await the run's result.
+    """
+    job, joined = scheduler.trigger(name, fn, params=params)
+    if background:
+        return JSONResponse(status_code=202, content={
+            "job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}",
+            "joined": joined,
+        })
+    return await jobs.wait(job)
+
 # ---------------- Health ----------------
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok", "backend": BACKEND_NAME}
 
+# ---------------- Metrics ----------------
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# ---------------- Jobs ----------------
+@app.get("/jobs")
+async def list_jobs(name: Optional[str] = None):
+    return jobs.list(name)
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="unknown job")
+    return job.to_dict()
+
+@app.get("/refresh/history")
+async def refresh_history(name: Optional[str] = None):
+    """Recent refresh runs (newest first) plus the scheduler state per pipeline."""
+    return {"pipelines": scheduler.status(), "runs": scheduler.history(name)}
+
 # ---------------- Articles (news) ----------------
+_articles_cache = ResponseCache("articles", ttl=ARTICLES_CACHE_TTL, stale=ARTICLES_CACHE_STALE)
+
 @app.get("/articles")
-def articles():
+async def articles(
+    cursor: Optional[str] = None,
+    limit: int = Query(ARTICLES_PAGE_SIZE, ge=1, le=ARTICLES_PAGE_MAX),
+    region: Optional[str] = None,
+    topic: Optional[str] = None,
+    source: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+):
     """
-    Return news articles from the current backend (Supabase/Airtable reader).
+    Return news articles from the current backend (Supabase or local SQLite).
+    Keyset-paginated, newest first: pass the X-Next-Cursor response header back
+    as ?cursor=... for the next page. region/topic/source/since/until are applied
+    in the database query. Served from an in-process cache of the serialized JSON.
     """
-    print("📰  Fetching articles from", BACKEND_NAME)
-    return get_articles()
+    filters = {
+        "region": region, "topic": topic, "source": source,
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+    }
+
+    async def load():
+        print("📰  Fetching articles from", BACKEND_NAME)
+        rows, next_cursor = await aget_articles_page(limit=limit, cursor=cursor, **filters)
+        return rows, {"next_cursor": next_cursor}
+
+    key = (cursor, limit) + tuple(sorted(filters.items()))
+    try:
+        body, meta = await _articles_cache.aget(key, load)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {}
+    if meta and meta.get("next_cursor"):
+        headers["X-Next-Cursor"] = meta["next_cursor"]
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# ---------------- Search ----------------
+if SEARCH_ENABLED:
+    @app.get("/search")
+    async def search(
+        q: str = Query(..., min_length=1),
+        region: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        limit: int = Query(20, ge=1, le=SEARCH_LIMIT_MAX),
+    ):
+        """
+        Full-text search over stored articles (title, summary, keywords, source,
+        region), best match first. Served from the local FTS index the writer
+        keeps up to date, not from Supabase.
+        """
+        return await asyncio.to_thread(
+            get_search_index().search, q, region,
+            since.isoformat() if since else None, until.isoformat() if until else None, limit,
+        )
 
 @app.post("/refresh")
-def refresh():
+async def refresh(full: bool = False, stream: bool = REFRESH_STREAMING, background: bool = False):
     """
-    Fetch RSS news -> filter -> write to backend (Supabase/Airtable).
+    Fetch RSS news -> filter -> write to backend (Supabase or local SQLite).
+    Incremental by default (only unseen links); ?full=true forces a full resync.
+    ?stream=true pipes items into the writer chunk by chunk instead of building the full list first.
+    ?background=true returns 202 with a job id right away (poll GET /jobs/{id}).
+    If a news refresh with the same full/stream is already running (or queued), the call
+    joins it instead of crawling again; other parameters queue a run behind it.
     """
-    print("🔄  Fetching new RSS articles...")
-    news = fetch_filtered_news(days_limit=DAYS_LIMIT)
+    return await _run_job("news", lambda: _refresh_news(full, stream), background,
+                          params={"full": full, "stream": stream})
+
+async def _refresh_news(full: bool, stream: bool) -> dict:
+    print("🔄  Fetching new RSS articles..." + (" (full resync)" if full else ""))
+    incremental = INCREMENTAL_REFRESH and not full
+    if stream:
+        return await _refresh_streaming(incremental)
+
+    news = await afetch_filtered_news(days_limit=DAYS_LIMIT, incremental=incremental)
     print(f"✅  Fetched {len(news)} items.")
 
-    if BACKEND_NAME == "supabase":
-        print("☁️  Writing to Supabase...")
-        written, errs, sample = write_to_backend(news)
-        print(f"✅  Written {written} rows. Errors: {len(errs)}")
-        if errs:
-            print("Example error:", errs[0])
-        return {
-            "status": "updated",
-            "fetched": len(news),
-            "written": written,
-            "backend_errors": errs,
-            "backend_sample": sample,
-        }
-    else:
-        print("✈️  Writing to Airtable...")
-        write_to_backend(news)
-        print("✅  Done writing to Airtable.")
-        return {"status": "updated", "fetched": len(news)}
+    print(f"☁️  Writing to {BACKEND_NAME}...")
+    written, errs, sample = await awrite_to_backend(news)
+    _articles_cache.invalidate()
+    print(f"✅  Written {written} rows. Errors: {len(errs)}")
+    if errs:
+        print("Example error:", errs[0])
+    return {
+        "status": "updated",
+        "fetched": len(news),
+        "written": written,
+        "backend_errors": errs,
+        "backend_sample": sample,
+    }
+
+async def _refresh_streaming(incremental: bool) -> dict:
+    fetched = 0
+
+    async def counted(items):
+        nonlocal fetched
+        async for it in items:
+            fetched += 1
+            yield it
+
+    print(f"☁️  Streaming to {BACKEND_NAME}...")
+    written, errs, sample = await awrite_to_backend(
+        counted(aiter_filtered_news(days_limit=DAYS_LIMIT, incremental=incremental))
+    )
+    _articles_cache.invalidate()
+    print(f"✅  Fetched {fetched} items, written {written} rows. Errors: {len(errs)}")
+    if errs:
+        print("Example error:", errs[0])
+    return {
+        "status": "updated",
+        "fetched": fetched,
+        "written": written,
+        "backend_errors": errs,
+        "backend_sample": sample,
+    }
 
 # ---------------- Events (new) ----------------
+_events_cache = ResponseCache("events", ttl=EVENTS_CACHE_TTL, stale=EVENTS_CACHE_STALE)
+
 @app.get("/events")
-def list_events():
+async def list_events(
+    days: int = Query(EVENTS_HORIZON_DAYS, ge=0),
+    limit: int = Query(EVENTS_READ_LIMIT, ge=0),
+):
     """
     Return upcoming energy events (starts_on >= today), ordered asc.
-    Reads directly from Supabase via service role on the server.
+    ?days=N keeps the next N days only, ?limit=N caps the count (0 = no bound).
+    Reads from the storage backend (Supabase via service role, or local SQLite); cached per
+    calendar day until the next /refresh/events.
     """
-    print("📅  Fetching upcoming events (Supabase)")
-    events = fetch_upcoming_events()
-    print(f"✅  Returned {len(events)} upcoming events.")
-    return events
+    today = date.today()
+
+    async def load():
+        print(f"📅  Fetching upcoming events ({BACKEND_NAME})")
+        # both readers are blocking: run them in a worker thread
+        events = await asyncio.to_thread(fetch_upcoming_events, days, limit, today)
+        print(f"✅  Returned {len(events)} upcoming events.")
+        return events
+
+    body, _ = await _events_cache.aget((today.isoformat(), days, limit), load)
+    return Response(content=body, media_type="application/json")
 
 @app.post("/refresh/events")
-def refresh_events():
+async def refresh_events(background: bool = False):
     """
-    Run the events ETL (Reuters -> normalize -> upsert to Supabase),
+    Run the events ETL (Reuters -> normalize -> upsert to the backend),
     then return simple stats for the UI.
+    ?background=true returns 202 with a job id right away (poll GET /jobs/{id}).
+    If an events run is already in flight, the call joins it.
     """
-    print("🔄  Running Events ETL (Reuters -> Supabase)...")
-    stats = run_events_ingest()
+    return await _run_job("events", _refresh_events, background)
+
+async def _refresh_events() -> dict:
+    print(f"🔄  Running Events ETL (Reuters -> {BACKEND_NAME})...")
+    # Pages render concurrently in the long-lived browser pool; the supabase-py upsert runs in a thread
+    stats = await arun_events_ingest()
+    _events_cache.invalidate()
     print(f"✅  Events ETL done. Stats: {stats}")
     return {"ok": True, "stats": stats}
+
+scheduler.register("news", lambda: _refresh_news(False, REFRESH_STREAMING),
+                   interval=NEWS_REFRESH_INTERVAL, jitter=REFRESH_JITTER,
+                   params={"full": False, "stream": REFRESH_STREAMING})
+scheduler.register("events", _refresh_events,
+                   interval=EVENTS_REFRESH_INTERVAL, jitter=REFRESH_JITTER)
@@ -0,0 +1,206 @@
+# back/metrics.py
+"""
+Pipeline instrumentation (no external deps).
+
+Counters and histograms live in a process-wide registry and are rendered
+in the Prometheus text format by GET /metrics. `timed("stage")` wraps a
+function (sync or async) to record its duration under that stage name;
+the same timings are collected per request for the optional
+Server-Timing response header (see main.py).
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "Counter", "Histogram", "render", "timed", "stage",
+    "begin_request_timings", "end_request_timings", "server_timing_header",
+    "STAGE_SECONDS", "STAGE_ERRORS", "FEED_FETCHES", "FEED_BYTES", "FEED_SECONDS",
+    "RSS_ITEMS", "UPSTREAM_RESPONSES", "UPSTREAM_RETRIES", "ROWS_WRITTEN",
+    "API_REQUESTS", "API_SECONDS",
+]
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_REGISTRY: List["_Metric"] = []
+_lock = threading.Lock()
+
+
+def _esc(v: str) -> str:
+    return str(v).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_esc(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        with _lock:
+            _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        out = super().render()
+        with _lock:
+            items = list(self._values.items())
+        for key, v in items:
+            out.append(f"{self.name}{_fmt_labels(self.labels, key)} {v}")
+        return out
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = _DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            st = self._values.get(key)
+            if st is None:
+                st = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    st[0][i] += 1
+            st[1] += value
+            st[2] += 1
+
+    def render(self) -> List[str]:
+        out = super().render()
+        with _lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        for key, (counts, total, n) in items:
+            for b, c in zip(self.buckets, counts):
+                le = _fmt_labels(self.labels, key, 'le="%s"' % b)
+                out.append(f"{self.name}_bucket{le} {c}")
+            le = _fmt_labels(self.labels, key, 'le="+Inf"')
+            out.append(f"{self.name}_bucket{le} {n}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {round(total, 6)}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {n}")
+        return out
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (0.0.4)."""
+    with _lock:
+        metrics = list(_REGISTRY)
+    lines: List[str] = []
+    for m in metrics:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------
+# Metrics used across the pipelines
+# ---------------------------------------------------------------------
+STAGE_SECONDS = Histogram("engie_stage_duration_seconds", "Duration of pipeline stages", ["stage"])
+STAGE_ERRORS = Counter("engie_stage_errors_total", "Pipeline stages that raised", ["stage"])
+
+FEED_FETCHES = Counter("engie_feed_fetches_total", "RSS feed fetches by result (HTTP status / error)", ["feed", "status"])
+FEED_BYTES = Counter("engie_feed_bytes_total", "RSS bytes downloaded", ["feed"])
+FEED_SECONDS = Histogram("engie_feed_seconds", "Per-feed download / parse time", ["phase"])
+RSS_ITEMS = Counter("engie_rss_items_total", "RSS entries per filter outcome", ["outcome"])
+
+UPSTREAM_RESPONSES = Counter("engie_upstream_responses_total", "Responses from upstream HTTP APIs", ["target", "status"])
+UPSTREAM_RETRIES = Counter("engie_upstream_retries_total", "Retried upstream HTTP requests", ["target"])
+ROWS_WRITTEN = Counter("engie_rows_written_total", "Rows upserted", ["table"])
+
+API_REQUESTS = Counter("engie_api_requests_total", "API requests served", ["method", "route", "status"])
+API_SECONDS = Histogram("engie_api_request_duration_seconds", "API request latency", ["route"])
+
+
+# ---------------------------------------------------------------------
+# Stage timing (+ per-request Server-Timing collection)
+# ---------------------------------------------------------------------
+_request_timings: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("request_timings", default=None)
+
+
+def _record(name: str, seconds: float, failed: bool) -> None:
+    STAGE_SECONDS.observe(seconds, stage=name)
+    if failed:
+        STAGE_ERRORS.inc(stage=name)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    t0, failed = time.perf_counter(), False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _record(name, time.perf_counter() - t0, failed)
+
+
+def timed(name: str):
+    """Decorator: record the call's duration as stage `name` (sync or async functions)."""
+    def deco(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def awrapper(*args, **kwargs):
+                with stage(name):
+                    return await fn(*args, **kwargs)
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def begin_request_timings() -> contextvars.Token:
+    """Start collecting stage timings for the current request (middleware)."""
+    return _request_timings.set([])
+
+
+def end_request_timings(token: contextvars.Token) -> None:
+    _request_timings.reset(token)
+
+
+def server_timing_header(total_seconds: float) -> str:
+    """Server-Timing value for the current request: each stage plus the total."""
+    parts = []
+    for name, secs in _request_timings.get() or []:
+        token = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        parts.append(f"{token};dur={secs * 1000:.1f}")
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
@@ -0,0 +1,262 @@
+# back/models.py
+"""
+Record types that flow through the pipelines.
+
+`Article` (news) and `Event` (events) are slotted dataclasses: no per-item
+__dict__, and the low-cardinality strings (source, region, feed, topic
+keywords) are interned so thousands of items share one copy. Each type
+serializes straight to the Supabase row payload and (for articles) to the
+frontend JSON shape, so items are not re-copied into intermediate dicts.
+
+For older callers both types also answer the dict protocol with the legacy
+keys (item["Link"], item.get("PublishedAt"), ...); as_dict() gives the full
+legacy dict (e.g. for rss_preview.json).
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+__all__ = ["Article", "Event", "intern_str", "domain_of", "region_from_source"]
+
+
+def intern_str(s: Optional[str]) -> str:
+    return sys.intern(s) if s else ""
+
+
+def domain_of(link: str) -> str:
+    try:
+        return urlparse(link or "").netloc
+    except Exception:
+        return ""
+
+
+def region_from_source(source: str, link: str) -> str:
+    """Last-resort region for stored rows without one (ccTLD / name sniff)."""
+    t = f"{source or ''} {link or ''}".lower()
+    for suf, name in [
+        (".ph", "Philippines"), (".sg", "Singapore"), (".my", "Malaysia"),
+        (".id", "Indonesia"),   (".vn", "Vietnam"),   (".th", "Thailand"),
+    ]:
+        if suf in t:
+            return name
+    return "Global"
+
+
+def _split_text(v: Any) -> Tuple[str, ...]:
+    # "A, B" (or a list) -> ("A", "B")
+    parts = v.split(",") if isinstance(v, str) else (v or ())
+    return tuple(intern_str(p.strip()) for p in parts if p and p.strip())
+
+
+def _canon(u: str) -> str:
+    try:
+        p = urlparse(u or "")
+        return f"{p.scheme}://{p.netloc}{p.path}"
+    except Exception:
+        return u or ""
+
+
+class _LegacyKeys:
+    """dict-style access by legacy key for code that still treats items as dicts."""
+    __slots__ = ()
+    _KEYS: Dict[str, str] = {}
+    # keys backed by a derived (read-only) property: key -> value -> (field, stored value)
+    _SETTERS: Dict[str, Callable[[Any], Tuple[str, Any]]] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, self._KEYS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._SETTERS:
+            attr, value = self._SETTERS[key](value)
+        elif key in self._KEYS:
+            attr = self._KEYS[key]
+        else:
+            raise KeyError(key)
+        setattr(self, attr, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self._KEYS.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def keys(self):
+        return self._KEYS.keys()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: list(v) if isinstance(v, tuple) else v for k, v in ((k, self[k]) for k in self._KEYS)}
+
+
+@dataclass(slots=True, eq=False)
+class Article(_LegacyKeys):
+    title: str
+    link: str
+    source: str = ""
+    published_at: str = ""            # ISO timestamp from the feed, or a DATE from the DB
+    summary: str = ""
+    topic: Tuple[str, ...] = ()       # matched title keywords (chips)
+    regions: Tuple[str, ...] = ()     # every region found, priority order
+    region: str = "Global"            # primary region
+    feed: str = ""                    # originating feed (incremental watermark key)
+    id: Optional[str] = None          # DB id (rows read back from Supabase)
+    keywords_text: Optional[str] = None   # stored `keywords` column, when read from the DB
+
+    _KEYS = {
+        "Title": "title", "Link": "link", "Source": "source", "PublishedAt": "published_at",
+        "Summary": "summary", "Topic": "topic", "Keywords": "keywords",
+        "Regions": "regions", "Region": "region", "RegionsText": "regions_text", "Feed": "feed",
+    }
+    _SETTERS = {
+        "Keywords": lambda v: ("keywords_text", None if v is None else str(v)),
+        "RegionsText": lambda v: ("regions", _split_text(v)),
+        "Topic": lambda v: ("topic", _split_text(v)),
+        "Regions": lambda v: ("regions", _split_text(v)),
+    }
+
+    def __post_init__(self):
+        self.source = intern_str(self.source)
+        self.region = intern_str(self.region)   # "" = unknown (stored rows without one)
+        self.feed = intern_str(self.feed)
+        self.topic = tuple(intern_str(t) for t in self.topic or ())
+        self.regions = tuple(intern_str(r) for r in self.regions or ())
+
+    @property
+    def keywords(self) -> str:
+        if self.keywords_text is not None:
+            return self.keywords_text
+        return ", ".join(self.topic)
+
+    @property
+    def regions_text(self) -> str:
+        return ", ".join(self.regions)
+
+    # ---------- constructors ----------
+    @classmethod
+    def from_item(cls, a: Any) -> "Article":
+        """Accept an Article or a legacy RSS item dict."""
+        if isinstance(a, Article):
+            return a
+        topic = a.get("Topic")
+        return cls(
+            title=a.get("Title", "") or "",
+            link=a.get("Link", "") or "",
+            source=a.get("Source", "") or "",
+            published_at=a.get("Published") or a.get("PublishedAt") or "",
+            summary=a.get("Summary", "") or "",
+            topic=tuple(topic) if isinstance(topic, (list, tuple)) else (),
+            regions=tuple(a.get("Regions") or ()),
+            region=a.get("Region", "Global") or "Global",
+            feed=a.get("Feed", "") or "",
+            keywords_text=a.get("Keywords") or None,
+        )
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Article":
+        """A Supabase `news` row."""
+        topic = row.get("topic")
+        return cls(
+            title=row.get("title", ""),
+            link=row.get("link", ""),
+            source=row.get("source") or "",
+            published_at=row.get("published") or "",
+            summary=row.get("summary", ""),
+            topic=tuple(topic) if isinstance(topic, list) else (),
+            region=row.get("region") or "",
+            id=row.get("id"),
+            keywords_text=row.get("keywords") or "",
+        )
+
+    # ---------- serializers ----------
+    def to_row(self) -> dict:
+        """Supabase upsert payload (news table)."""
+        pub = self.published_at
+        published = pub.split("T", 1)[0] if isinstance(pub, str) and "T" in pub else pub
+        kw = self.keywords or "Energy"
+        return {
+            "title": self.title,
+            "link": _canon(self.link),
+            "source": self.source,
+            "published": published,        # DATE (YYYY-MM-DD) or empty
+            "summary": self.summary,
+            "keywords": kw,
+            "region": self.region or "Global",
+            "topic": list(self.topic),     # jsonb array
+        }
+
+    def to_frontend(self) -> dict:
+        """Shape the React app expects from GET /articles."""
+        link = self.link
+        source = self.source or domain_of(link)
+        return {
+            "Title": self.title,
+            "Link": link,
+            "Source": source,
+            "PublishedAt": self.published_at or "",
+            "Summary": self.summary,
+            "Topic": list(self.topic),
+            "Region": self.region or region_from_source(source, link),
+            "Keywords": self.keywords_text or "",
+            "Bookmarked": False,
+            "id": link or self.id or "",
+        }
+
+
+@dataclass(slots=True, eq=False)
+class Event(_LegacyKeys):
+    title: str
+    starts_on: str                    # ISO date
+    region: Optional[str] = None
+    city: Optional[str] = None
+    venue: Optional[str] = None
+    ends_on: Optional[str] = None
+    link: Optional[str] = None
+    source: str = "AllConferenceAlert"
+
+    _KEYS = {k: k for k in ("title", "region", "city", "venue", "starts_on", "ends_on", "link", "source")}
+
+    def __post_init__(self):
+        self.region = intern_str(self.region) or None
+        self.city = intern_str(self.city) or None
+        self.source = intern_str(self.source) or "AllConferenceAlert"
+
+    @classmethod
+    def from_item(cls, r: Any) -> "Event":
+        """Accept an Event or a normalized event dict."""
+        if isinstance(r, Event):
+            return r
+        return cls(
+            title=(r.get("title") or "").strip(),
+            starts_on=(r.get("starts_on") or "").strip(),
+            region=r.get("region"),
+            city=r.get("city"),
+            venue=r.get("venue"),
+            ends_on=r.get("ends_on") or None,
+            link=r.get("link"),
+            source=r.get("source") or "AllConferenceAlert",
+        )
+
+    def dedupe_key(self) -> Tuple[str, str, str]:
+        # mirrors the DB dedupe_key: title + region + starts_on
+        return ((self.title or "").strip().lower(), (self.region or "").strip().lower(), self.starts_on or "")
+
+    def to_row(self) -> dict:
+        """Supabase upsert payload (events table)."""
+        return {
+            "title": self.title,
+            "region": self.region,
+            "city": self.city,
+            "venue": self.venue,
+            "starts_on": self.starts_on,
+            "ends_on": self.ends_on or None,
+            "link": self.link,
+            "source": self.source or "AllConferenceAlert",
+        }
+
@@ -0,0 +1,241 @@
+# back/near_dupes.py
+"""
+Near-duplicate detection for article titles (MinHash + LSH bands).
+
+The same story reaches us through Google News and the publisher's own feed
+with different URLs and slightly different headlines. Each normalized
+title becomes a set of words with a 64-value MinHash signature, split into
+16 bands of 4 rows: titles sharing any band bucket are candidates, and a
+candidate is a near-duplicate when the exact Jaccard similarity of the two
+word sets is >= NEAR_DUP_THRESHOLD. A lookup therefore touches only its own
+buckets, not the whole index.
+
+Stored titles (the canonical representative = first one written) persist
+in CACHE_DIR across refreshes; the writer records every stored chunk, like
+the seen-link store.
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, Set, Tuple
+
+from .config import NEAR_DUP_THRESHOLD, NEAR_DUP_MIN_TOKENS, SEEN_RETENTION_DAYS
+from .json_store import cache_path, load_json, save_json
+
+__all__ = ["normalize_title", "minhash", "MinHashLSH", "NearDupIndex", "get_near_dup_index"]
+
+_PERMS, _ROWS = 64, 4                     # 16 bands x 4 rows
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)            # fixed: signatures must be stable across runs
+_AB = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_PERMS)]
+
+# " - Reuters", " | The Business Times": publisher suffixes added by aggregators
+_SUFFIX = re.compile(r"\s+[-–—|]\s+[^-–—|]{1,40}$")
+_NON_WORD = re.compile(r"[^\w\s]+")
+_STOP = frozenset("a an the of to in on for and or at by with as is are be from its it s".split())
+
+
+@lru_cache(maxsize=4096)
+def normalize_title(title: str) -> FrozenSet[str]:
+    # memoized like the signatures: check() and mark_written() see every title
+    t = unicodedata.normalize("NFKC", title or "").lower()
+    t = _SUFFIX.sub("", t)
+    t = _NON_WORD.sub(" ", t.replace("’", "'").replace("'", ""))
+    return frozenset(w for w in t.split() if w not in _STOP)
+
+
+def _h64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@lru_cache(maxsize=1 << 15)
+def _permuted(token: str) -> Tuple[int, ...]:
+    # all 64 permutation values of one word; headline vocabulary repeats a lot
+    x = _h64(token)
+    return tuple((a * x + b) % _PRIME for a, b in _AB)
+
+
+@lru_cache(maxsize=4096)
+def _signature(tokens: FrozenSet[str]) -> Tuple[int, ...]:
+    # the same title is fingerprinted by check() and again by mark_written()
+    return tuple(map(min, zip(*map(_permuted, tokens))))
+
+
+def minhash(tokens: Iterable[str]) -> Tuple[int, ...]:
+    return _signature(frozenset(tokens))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """Band buckets over MinHash signatures; candidates are verified by exact Jaccard."""
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD):
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._items: Dict[str, Tuple[FrozenSet[str], Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _keys(sig: Tuple[int, ...]):
+        for b in range(0, _PERMS, _ROWS):
+            yield b, sig[b:b + _ROWS]
+
+    def add(self, key: str, tokens: FrozenSet[str], sig: Optional[Tuple[int, ...]] = None) -> None:
+        if key in self._items:
+            self.remove(key)
+        sig = sig or minhash(tokens)
+        self._items[key] = (tokens, sig)
+        for k in self._keys(sig):
+            self._buckets.setdefault(k, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        for k in self._keys(item[1]):
+            bucket = self._buckets.get(k)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[k]
+
+    def tokens(self, key: str) -> Optional[FrozenSet[str]]:
+        item = self._items.get(key)
+        return item[0] if item else None
+
+    def nearest(self, tokens: FrozenSet[str], sig: Tuple[int, ...]) -> Optional[str]:
+        """Most similar stored key with Jaccard >= threshold, or None."""
+        best, best_j = None, self.threshold
+        checked: Set[str] = set()
+        for k in self._keys(sig):
+            for key in self._buckets.get(k, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                j = jaccard(tokens, self._items[key][0])
+                if j >= best_j:
+                    best, best_j = key, j
+        return best
+
+
+class NearDupIndex:
+    def __init__(self, path: str, threshold: float = NEAR_DUP_THRESHOLD,
+                 min_tokens: int = NEAR_DUP_MIN_TOKENS):
+        self.path = path
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self._lock = threading.Lock()
+        self._lsh = MinHashLSH(threshold)
+        self._meta: Dict[str, Tuple[str, float]] = {}   # canonical link -> (title, stored at)
+        for link, (title, ts) in (load_json(path, {}).get("items") or {}).items():
+            tokens = normalize_title(title)
+            if len(tokens) >= min_tokens:
+                self._lsh.add(link, tokens)
+                self._meta[link] = (title, ts)
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def _fingerprint(self, title: str):
+        tokens = normalize_title(title)
+        if len(tokens) < self.min_tokens:
+            return None, None   # too short to compare reliably
+        return tokens, minhash(tokens)
+
+    def canonical(self, title: str, link: str = "") -> Optional[str]:
+        """Link of the stored near-duplicate of `title` (None if new, or if it *is* `link`)."""
+        tokens, sig = self._fingerprint(title)
+        if tokens is None:
+            return None
+        with self._lock:
+            hit = self._lsh.nearest(tokens, sig)
+        return None if hit is None or hit == (link or "").strip().lower() else hit
+
+    def new_batch(self) -> MinHashLSH:
+        """Per-refresh index of items accepted so far (see check)."""
+        return MinHashLSH(self.threshold)
+
+    def check(self, it: dict, batch: MinHashLSH) -> Optional[str]:
+        """
+        Canonical link if `it` near-duplicates a stored article or an item
+        already accepted into `batch`; otherwise None (and `it` joins the batch).
+        """
+        link = (it.get("Link") or "").strip().lower()
+        tokens, sig = self._fingerprint(it.get("Title") or "")
+        if tokens is None:
+            return None
+        with self._lock:
+            hit = self._lsh.nearest(tokens, sig)
+        if hit is None or hit == link:
+            hit = batch.nearest(tokens, sig)
+        if hit is not None and hit != link:
+            return hit
+        batch.add(link, tokens, sig)
+        return None
+
+    def filter(self, items: Iterable[dict], on_drop=None) -> Iterator[dict]:
+        """Drop near-duplicates from a stream (first one wins); on_drop(item, canonical_link)."""
+        batch = self.new_batch()
+        for it in items:
+            hit = self.check(it, batch)
+            if hit is not None:
+                if on_drop is not None:
+                    on_drop(it, hit)
+                continue
+            yield it
+
+    def mark_written(self, items: Iterable[dict]) -> None:
+        now = time.time()
+        with self._lock:
+            for it in items:
+                link = (it.get("Link") or "").strip().lower()
+                title = it.get("Title") or ""
+                tokens, sig = self._fingerprint(title)
+                if not link or tokens is None or self._lsh.nearest(tokens, sig) not in (None, link):
+                    continue   # keep the existing canonical
+                self._lsh.add(link, tokens, sig)
+                self._meta[link] = (title, now)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._lsh = MinHashLSH(self.threshold)
+            self._meta.clear()
+
+    def save(self) -> None:
+        cutoff = time.time() - SEEN_RETENTION_DAYS * 86400
+        with self._lock:
+            for link in [k for k, (_, ts) in self._meta.items() if ts < cutoff]:
+                self._lsh.remove(link)
+                del self._meta[link]
+            # titles only: signatures are cheap to rebuild on load
+            data = {"items": {link: [title, ts] for link, (title, ts) in self._meta.items()}}
+        try:
+            save_json(self.path, data)
+        except Exception as e:
+            print(f"[DEDUP] Could not save {self.path}: {e}")
+
+
+_INDEX: Optional[NearDupIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_near_dup_index() -> NearDupIndex:
+    """Process-wide index, loaded lazily from CACHE_DIR."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = NearDupIndex(cache_path("near_dupes.json"))
+        return _INDEX
@@ -0,0 +1,126 @@
+# back/response_cache.py
+"""
+In-process response cache for hot read endpoints.
+
+Entries hold the *pre-serialized* JSON body, so a hit is a memory copy
+into the HTTP response. Freshness has two windows:
+  age < ttl                -> served as is
+  ttl <= age < ttl + stale -> served stale while one background task refreshes it
+  older / missing          -> loaded inline (concurrent misses share one load)
+invalidate() drops everything, e.g. after /refresh wrote new rows; loads
+already running are forgotten too, so the next miss starts a fresh one.
+
+Used from the async handlers: loads and background refreshes are asyncio
+tasks on the API's event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+def dumps_body(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class _Entry:
+    __slots__ = ("body", "created", "meta")
+
+    def __init__(self, body: bytes, created: float, meta: Optional[dict]):
+        self.body = body
+        self.created = created
+        self.meta = meta
+
+
+class ResponseCache:
+    def __init__(self, name: str, ttl: float, stale: float = 0.0, max_entries: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0          # bumped by invalidate(); stale loads are discarded
+        self._atasks: dict = {}       # key -> asyncio.Task for in-flight async loads
+        self._awaited: set = set()    # background refreshes a foreground miss has joined
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def aget(self, key: Hashable, aloader: Callable[[], Awaitable[Any]]) -> tuple[bytes, Optional[dict]]:
+        """
+        Return (json_body, meta) for `key`. `aloader` is a coroutine function
+        returning either the data to serialize, or a (data, meta) tuple; meta
+        is handed back untouched (e.g. pagination headers).
+        """
+        if not self.enabled:
+            return self._pack(await aloader())
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                age = time.monotonic() - entry.created
+                if age < self.ttl:
+                    return entry.body, entry.meta
+                if age < self.ttl + self.stale:
+                    if key not in self._atasks:
+                        self._start_async_load(key, aloader, background=True)
+                    return entry.body, entry.meta
+            task = self._atasks.get(key)
+            if task is None:
+                task = self._start_async_load(key, aloader, background=False)
+            else:
+                self._awaited.add(task)   # a failed refresh must raise here, not return None
+        # concurrent misses await the same task; shield so one cancelled caller doesn't cancel it
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            # in-flight loads may have read pre-invalidation data: let them finish for
+            # their current waiters (their result isn't stored), but don't join them
+            self._atasks.clear()
+
+    # ---------- internals ----------
+    @staticmethod
+    def _pack(out: Any) -> tuple[bytes, Optional[dict]]:
+        data, meta = out if isinstance(out, tuple) else (out, None)
+        return dumps_body(data), meta
+
+    def _start_async_load(self, key: Hashable, aloader, background: bool) -> "asyncio.Task":
+        # caller holds self._lock
+        gen = self._generation
+
+        async def run():
+            try:
+                body, meta = self._pack(await aloader())
+                self._store(key, body, meta, gen)
+                return body, meta
+            except Exception as e:
+                if not background or task in self._awaited:
+                    raise
+                print(f"[CACHE] {self.name}: background refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._awaited.discard(task)
+                    if self._atasks.get(key) is task:   # not a newer load started after invalidate()
+                        del self._atasks[key]
+
+        task = self._atasks[key] = asyncio.ensure_future(run())
+        return task
+
+    def _store(self, key: Hashable, body: bytes, meta: Optional[dict], gen: int) -> None:
+        with self._lock:
+            if gen != self._generation:
+                return  # invalidated while loading; don't resurrect old data
+            self._entries[key] = _Entry(body, time.monotonic(), meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,137 @@
+# back/scheduler.py
+"""
+In-process refresh scheduler for the ETL pipelines (news / events).
+
+- single-flight: while a pipeline's run is in flight, further triggers
+  (API calls or the timer) with the same parameters join that run instead of
+  starting another crawl; a trigger with different parameters (e.g. a full
+  resync during an incremental run) is queued to start once it finishes, so
+  runs of one pipeline never overlap and no requested run is dropped
+- periodic runs: each pipeline can have an interval (seconds, 0 = manual
+  only), spread with +/- jitter so restarts don't line up on the feeds
+- history: the last N finished runs per scheduler, for GET /refresh/history
+
+Runs are Jobs in the shared JobRegistry, so GET /jobs/{id} works for them too.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .jobs import Job, JobRegistry
+
+__all__ = ["RefreshScheduler"]
+
+RunFn = Callable[[], Awaitable[Any]]
+
+
+class _Pipeline:
+    def __init__(self, name: str, fn: RunFn, params: Any, interval: float, jitter: float):
+        self.name = name
+        self.fn = fn
+        self.params = params
+        self.interval = interval
+        self.jitter = jitter
+        self.runs: List[Tuple[Job, Any]] = []  # (job, params) running or queued, oldest first
+        self.joins: Dict[str, int] = {}  # job id -> triggers coalesced into it
+        self.timer: Optional[asyncio.Task] = None
+        self.next_run_at: Optional[float] = None
+
+
+class RefreshScheduler:
+    def __init__(self, jobs: JobRegistry, history_size: int = 50):
+        self.jobs = jobs
+        self._pipelines: Dict[str, _Pipeline] = {}
+        self._history: deque = deque(maxlen=history_size)
+
+    def register(self, name: str, fn: RunFn, interval: float = 0, jitter: float = 0.1,
+                 params: Any = None) -> None:
+        """
+        `fn` is the default (timer) run and `params` its parameters (compared
+        with ==); `interval` in seconds, 0 disables periodic runs.
+        """
+        self._pipelines[name] = _Pipeline(name, fn, params, interval, jitter)
+
+    def trigger(self, name: str, fn: Optional[RunFn] = None, source: str = "api",
+                params: Any = None) -> Tuple[Job, bool]:
+        """
+        Start a run of `name` (with `fn` / `params` overriding the default
+        run), join a running or queued run with equal params, or queue it
+        behind the runs in flight. Returns (job, joined).
+        """
+        p = self._pipelines[name]
+        if fn is None:
+            params = p.params
+        p.runs = [(j, k) for j, k in p.runs if not j.done]
+        for job, k in p.runs:
+            if k == params:
+                p.joins[job.id] += 1
+                print(f"⏩  {name} refresh already {job.status} ({job.id}); {source} trigger joins it")
+                return job, True
+
+        after = p.runs[-1][0] if p.runs else None
+        job = self.jobs.submit(name, fn or p.fn, after=after)
+        job.task.add_done_callback(lambda _t, p=p, job=job, source=source: self._record(p, job, source))
+        if after is not None:
+            print(f"⏳  {name} refresh {after.id} runs with other parameters; {source} trigger queued as {job.id}")
+        p.runs.append((job, params))
+        p.joins[job.id] = 0
+        return job, False
+
+    def history(self, name: Optional[str] = None) -> list:
+        return [h for h in reversed(self._history) if name is None or h["name"] == name]
+
+    def status(self) -> dict:
+        loop = asyncio.get_running_loop()
+        out = {}
+        for name, p in self._pipelines.items():
+            active = [j for j, _ in p.runs if not j.done]
+            out[name] = {
+                "interval_s": p.interval,
+                "running": bool(active),
+                "current_job": active[0].id if active else None,
+                "queued_jobs": [j.id for j in active[1:]],
+                "next_run_in_s": (round(p.next_run_at - loop.time(), 1)
+                                  if p.next_run_at is not None else None),
+            }
+        return out
+
+    # ---------- periodic runs ----------
+    def start(self) -> None:
+        """Start timers for pipelines with an interval (call from the running loop)."""
+        for p in self._pipelines.values():
+            if p.interval > 0 and p.timer is None:
+                p.timer = asyncio.ensure_future(self._loop(p))
+                print(f"⏰  {p.name} refresh every {p.interval}s (±{int(p.jitter * 100)}%)")
+
+    async def stop(self) -> None:
+        timers = [p.timer for p in self._pipelines.values() if p.timer is not None]
+        for t in timers:
+            t.cancel()
+        await asyncio.gather(*timers, return_exceptions=True)
+        for p in self._pipelines.values():
+            p.timer, p.next_run_at = None, None
+
+    async def _loop(self, p: _Pipeline) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            delay = p.interval * random.uniform(1 - p.jitter, 1 + p.jitter)
+            p.next_run_at = loop.time() + delay
+            await asyncio.sleep(delay)
+            p.next_run_at = None
+            job, _ = self.trigger(p.name, source="schedule")
+            # wait for the run so a slow crawl never overlaps the next tick
+            await asyncio.wait({job.task})
+
+    # ---------- history ----------
+    def _record(self, p: _Pipeline, job: Job, source: str) -> None:
+        entry = job.to_dict()
+        entry["trigger"] = source
+        entry["joined"] = p.joins.pop(job.id, 0)
+        if isinstance(entry["result"], dict):
+            # keep the counters; row samples / error lists stay on the job itself
+            entry["result"] = {k: v for k, v in entry["result"].items()
+                               if k not in ("backend_sample", "backend_errors")}
+        self._history.append(entry)
@@ -0,0 +1,201 @@
+# back/search_index.py
+"""
+Local full-text index over stored articles (SQLite FTS5, BM25 ranking).
+
+The writer adds every chunk the backend accepted, so the index follows the
+table without ever re-reading it. GET /search answers from this file:
+  articles      one row per canonical link (upserted, like the news table)
+  articles_fts  external-content FTS5 over title / summary / keywords /
+                source / region, kept in sync by triggers
+Region and date filters run on the plain table; matches are ranked with
+bm25() (title weighted highest). An empty index (first run, new CACHE_DIR)
+is back-filled from the storage backend once, page by page.
+
+The index lives in its own file even with STORAGE_BACKEND=sqlite: it is a
+derived cache (delete it and it is rebuilt), and indexing a chunk on the
+writer's record thread doesn't wait on the news upsert for LOCAL_DB's
+single WAL write lock.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Iterable, List, Optional
+
+from .config import SEARCH_DB
+from .json_store import cache_path
+from .metrics import timed
+from .models import Article
+
+__all__ = ["SearchIndex", "get_search_index", "fts_query"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id        INTEGER PRIMARY KEY,
+    link      TEXT NOT NULL UNIQUE,
+    title     TEXT NOT NULL DEFAULT '',
+    summary   TEXT NOT NULL DEFAULT '',
+    keywords  TEXT NOT NULL DEFAULT '',
+    source    TEXT NOT NULL DEFAULT '',
+    region    TEXT NOT NULL DEFAULT '',
+    published TEXT NOT NULL DEFAULT '',
+    topic     TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles(published);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, keywords, source, region,
+    content='articles', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary, keywords, source, region)
+    VALUES (new.id, new.title, new.summary, new.keywords, new.source, new.region);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, keywords, source, region)
+    VALUES ('delete', old.id, old.title, old.summary, old.keywords, old.source, old.region);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, keywords, source, region)
+    VALUES ('delete', old.id, old.title, old.summary, old.keywords, old.source, old.region);
+    INSERT INTO articles_fts(rowid, title, summary, keywords, source, region)
+    VALUES (new.id, new.title, new.summary, new.keywords, new.source, new.region);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO articles (link, title, summary, keywords, source, region, published, topic)
+VALUES (:link, :title, :summary, :keywords, :source, :region, :published, :topic)
+ON CONFLICT(link) DO UPDATE SET
+    title = excluded.title, summary = excluded.summary, keywords = excluded.keywords,
+    source = excluded.source, region = excluded.region, published = excluded.published,
+    topic = excluded.topic
+-- unchanged re-upserts (every full refresh) skip the FTS delete + reinsert trigger
+WHERE (title, summary, keywords, source, region, published, topic)
+      IS NOT (excluded.title, excluded.summary, excluded.keywords, excluded.source,
+              excluded.region, excluded.published, excluded.topic)
+"""
+
+# bm25() column weights: title, summary, keywords, source, region
+_BM25 = "bm25(articles_fts, 10.0, 2.0, 5.0, 1.0, 1.0)"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+# dropped from queries (every remaining word is required)
+_STOP = frozenset("a an and the of to in on for or not at by with is are from".split())
+
+
+def fts_query(q: str) -> Optional[str]:
+    """
+    User text -> FTS5 MATCH expression: every word except stop words must
+    match (implicit AND), the last one as a prefix so results follow typing. Words are quoted, so
+    FTS5 operators / punctuation in the input can't break the query.
+    """
+    words = _WORD.findall(q or "")
+    words = [w for w in words if w.lower() not in _STOP] or words
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    if not (q or "")[-1:].isspace():
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # one connection shared by the writer threads and the API; the lock serializes it
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM articles").fetchone()[0]
+
+    def add(self, rows: Iterable[dict]) -> int:
+        """Upsert payload rows (write_run.article_row output), one transaction."""
+        params = [{
+            "link": r.get("link") or "",
+            "title": r.get("title") or "",
+            "summary": r.get("summary") or "",
+            "keywords": r.get("keywords") or "",
+            "source": r.get("source") or "",
+            "region": r.get("region") or "",
+            "published": r.get("published") or "",
+            "topic": json.dumps(r.get("topic") or [], ensure_ascii=False),
+        } for r in rows if r.get("link")]
+        if not params:
+            return 0
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT, params)
+        return len(params)
+
+    @timed("search.query")
+    def search(self, q: str, region: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None, limit: int = 20) -> List[dict]:
+        """
+        Best matches first, in the GET /articles item shape plus "Score"
+        (higher is better). since / until are YYYY-MM-DD bounds on `published`.
+        """
+        match = fts_query(q)
+        if match is None:
+            return []
+        sql = [f"SELECT a.*, -{_BM25} AS score FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid",
+               "WHERE articles_fts MATCH ?"]
+        args: list = [match]
+        if region:
+            sql.append("AND a.region = ? COLLATE NOCASE")
+            args.append(region)
+        if since:
+            sql.append("AND a.published >= ? AND a.published != ''")
+            args.append(since)
+        if until:
+            sql.append("AND a.published != '' AND a.published <= ?")
+            args.append(until)
+        sql.append(f"ORDER BY {_BM25} LIMIT ?")
+        args.append(limit)
+        with self._lock:
+            rows = self._db.execute(" ".join(sql), args).fetchall()
+        out = []
+        for r in rows:
+            row = dict(r)
+            row["topic"] = json.loads(row["topic"] or "[]")
+            item = Article.from_row(row).to_frontend()
+            item["Score"] = round(row["score"], 4)
+            out.append(item)
+        return out
+
+    async def abackfill(self, aget_articles_page, page_size: int = 1000) -> int:
+        """
+        Index every stored article, read with the backend's aget_articles_page
+        (keyset pages); returns rows indexed. Inserts run in a worker thread.
+        """
+        total, cursor = 0, None
+        while True:
+            page, cursor = await aget_articles_page(limit=page_size, cursor=cursor)
+            rows = [Article.from_item(a).to_row() for a in page]
+            total += await asyncio.to_thread(self.add, rows)
+            if not cursor:
+                break
+        print(f"[SEARCH] Back-filled {total} articles into {self.path}")
+        return total
+
+
+_INDEX: Optional[SearchIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """Process-wide index, opened lazily from CACHE_DIR."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = SearchIndex(cache_path(SEARCH_DB))
+        return _INDEX
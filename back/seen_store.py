@@ -0,0 +1,101 @@
+# back/seen_store.py
+"""
+Local index of what has already been written to the backend:
+  - canonical links of stored articles (with their PublishedAt)
+  - per-feed watermark = newest PublishedAt written from that feed
+
+Incremental refreshes consult it before title filtering so only the delta
+reaches the writer. The writer records every successfully stored chunk.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from .config import SEEN_RETENTION_DAYS
+from .json_store import cache_path, load_json, save_json
+
+__all__ = ["SeenStore", "get_seen_store"]
+
+
+def _parse_ts(s: str) -> Optional[datetime]:
+    try:
+        d = datetime.fromisoformat((s or "").replace("Z", "+00:00"))
+    except Exception:
+        return None
+    return d if d.tzinfo else d.replace(tzinfo=timezone.utc)
+
+
+class SeenStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        data = load_json(path, {})
+        self._links: dict = data.get("links") or {}            # link -> PublishedAt
+        self._watermarks: dict = data.get("watermarks") or {}  # feed url -> PublishedAt
+        self._wm_cache: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def is_seen(self, link: str) -> bool:
+        return bool(link) and link.lower() in self._links
+
+    def watermark(self, feed: str) -> Optional[datetime]:
+        raw = self._watermarks.get(feed)
+        if not raw:
+            return None
+        if raw not in self._wm_cache:
+            self._wm_cache[raw] = _parse_ts(raw)
+        return self._wm_cache[raw]
+
+    def mark_written(self, items: Iterable[dict]) -> None:
+        """Record items (RSS item dicts with Link / PublishedAt / Feed) as stored."""
+        with self._lock:
+            for it in items:
+                link = (it.get("Link") or "").strip().lower()
+                if not link:
+                    continue
+                pub = it.get("PublishedAt") or ""
+                self._links[link] = pub
+                feed = it.get("Feed")
+                ts = _parse_ts(pub)
+                if feed and ts:
+                    cur = self.watermark(feed)
+                    if cur is None or ts > cur:
+                        self._watermarks[feed] = pub
+
+    def reset(self) -> None:
+        with self._lock:
+            self._links.clear()
+            self._watermarks.clear()
+            self._wm_cache.clear()
+
+    def save(self) -> None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=SEEN_RETENTION_DAYS)
+        with self._lock:
+            # links we can't date are kept; anything older than the retention
+            # window is already excluded by the days_limit cutoff upstream
+            self._links = {
+                k: v for k, v in self._links.items()
+                if (_parse_ts(v) or cutoff) >= cutoff
+            }
+            data = {"links": self._links, "watermarks": self._watermarks}
+        try:
+            save_json(self.path, data)
+        except Exception as e:
+            print(f"[SEEN] Could not save {self.path}: {e}")
+
+
+_STORE: Optional[SeenStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_seen_store() -> SeenStore:
+    """Process-wide store, loaded lazily from CACHE_DIR."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SeenStore(cache_path("seen_links.json"))
+        return _STORE
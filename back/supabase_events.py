@@ -1,68 +1,63 @@
 # back/supabase_events.py
 from __future__ import annotations
 import os, math
-from typing import List, Dict, Tuple
-from datetime import date
+import threading
+from typing import List, Dict, Optional, Tuple
+from datetime import date, timedelta
 from supabase import create_client, Client
 
+from .metrics import ROWS_WRITTEN, timed
+from .models import Event
+
 __all__ = ["upsert_events", "fetch_upcoming_events"]
 
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
 
-def _client() -> Client:
-    if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-        raise RuntimeError("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY")
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+# Columns the frontend renders (select("*") also shipped dedupe_key and timestamps)
+EVENT_COLUMNS = "id,title,region,city,venue,starts_on,ends_on,link,source"
 
-def _norm(s: str | None) -> str:
-    return (s or "").strip().lower()
+_client_instance: Optional[Client] = None
+_client_lock = threading.Lock()
 
-def _key(row: Dict) -> tuple[str, str, str]:
-    # mirrors your dedupe logic: title + region + starts_on
-    return (_norm(row.get("title")),
-            _norm(row.get("region")),
-            (row.get("starts_on") or "").strip())
+def _client() -> Client:
+    """Process-wide supabase-py client (its HTTP session and auth headers are reused)."""
+    global _client_instance
+    if _client_instance is None:
+        with _client_lock:
+            if _client_instance is None:
+                if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
+                    raise RuntimeError("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY")
+                _client_instance = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    return _client_instance
 
-def upsert_events(rows: List[Dict]) -> Tuple[int, int]:
+@timed("events.upsert")
+def upsert_events(rows: List[Event | Dict]) -> Tuple[int, int]:
     """
     Upsert normalized rows into public.events.
-    Expected keys per row: title, region, city, venue, starts_on, ends_on, link, source
+    Rows are Event records (or dicts with the same keys:
+    title, region, city, venue, starts_on, ends_on, link, source).
     Returns (written_count, skipped_count).
     """
     if not rows:
         return (0, 0)
 
-    # 1) sanitize + keep only valid rows
-    cleaned: List[Dict] = []
-    for r in rows:
-        title = (r.get("title") or "").strip()
-        starts_on = (r.get("starts_on") or "").strip()
-        if not title or not starts_on:
-            continue
-        cleaned.append({
-            "title": title,
-            "region": r.get("region"),
-            "city": r.get("city"),
-            "venue": r.get("venue"),
-            "starts_on": starts_on,
-            "ends_on": (r.get("ends_on") or None),
-            "link": r.get("link"),
-            "source": r.get("source") or "AllConferenceAlert",
-        })
-
-    if not cleaned:
-        return (0, len(rows))
-
+    # 1) sanitize + keep only valid rows, then
     # 2) dedupe **within this batch** to avoid the Postgres 21000 error
     seen = set()
     deduped: List[Dict] = []
-    for r in cleaned:
-        k = _key(r)
+    for r in rows:
+        ev = Event.from_item(r)
+        if not ev.title or not ev.starts_on:
+            continue
+        k = ev.dedupe_key()
         if k in seen:
             continue
         seen.add(k)
-        deduped.append(r)
+        deduped.append(ev.to_row())
+
+    if not deduped:
+        return (0, len(rows))
 
     # 3) upsert in small chunks (e.g., 200) and ignore duplicates against existing rows
     sb = _client()
@@ -78,15 +73,27 @@ def upsert_events(rows: List[Dict]) -> Tuple[int, int]:
         # supabase-py returns inserted/updated rows in resp.data
         written_total += len(resp.data or [])
 
+    ROWS_WRITTEN.inc(written_total, table="events")
     skipped = len(rows) - written_total
     return (written_total, max(0, skipped))
 
-def fetch_upcoming_events() -> List[Dict]:
+@timed("events.read")
+def fetch_upcoming_events(horizon_days: Optional[int] = None, limit: Optional[int] = None,
+                          today: Optional[date] = None) -> List[Dict]:
+    """
+    Events starting on or after `today`, ordered by start date.
+    `horizon_days` keeps only those starting within that many days; `limit` caps
+    the row count. Both are applied in the query, with the EVENT_COLUMNS projection.
+    """
     sb = _client()
-    today = date.today().isoformat()
-    resp = sb.table("events") \
-             .select("*") \
-             .gte("starts_on", today) \
-             .order("starts_on", desc=False) \
-             .execute()
+    today = today or date.today()
+    q = sb.table("events") \
+          .select(EVENT_COLUMNS) \
+          .gte("starts_on", today.isoformat())
+    if horizon_days:
+        q = q.lte("starts_on", (today + timedelta(days=horizon_days)).isoformat())
+    q = q.order("starts_on", desc=False)
+    if limit:
+        q = q.limit(limit)
+    resp = q.execute()
     return resp.data or []
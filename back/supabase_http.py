@@ -0,0 +1,150 @@
+# back/supabase_http.py
+"""
+Shared HTTP client for the Supabase REST (PostgREST) endpoint.
+
+One pooled httpx.AsyncClient per event loop, so chunked upserts and
+/articles reads reuse TCP+TLS connections instead of handshaking on every
+call. Transient failures (429 / 5xx / connection errors) are retried with
+exponential backoff, honouring Retry-After. Blocking entry points for
+scripts go through run_blocking(), which closes the client with its loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from typing import Any, Awaitable, Optional, TypeVar
+
+import httpx
+
+from .metrics import UPSTREAM_RESPONSES, UPSTREAM_RETRIES
+from .config import (
+    SUPABASE_URL, SUPABASE_SERVICE_KEY,
+    SUPABASE_POOL_SIZE, SUPABASE_MAX_RETRIES, SUPABASE_RETRY_BACKOFF,
+    SUPABASE_GZIP_REQUESTS, SUPABASE_GZIP_MIN_BYTES,
+)
+
+__all__ = [
+    "REST", "base_headers", "get_async_client", "close_async_client",
+    "arest_get", "arest_post", "run_blocking",
+]
+
+REST = f"{SUPABASE_URL.rstrip('/')}/rest/v1"
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+T = TypeVar("T")
+
+
+def base_headers() -> dict:
+    return {
+        "apikey": SUPABASE_SERVICE_KEY,
+        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip",
+    }
+
+
+def _encode(payload: Any) -> tuple[bytes, dict]:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if SUPABASE_GZIP_REQUESTS and len(body) >= SUPABASE_GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+# ---------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------
+_aclient: Optional[httpx.AsyncClient] = None
+_aclient_loop = None
+_ssl_ctx = None
+
+
+def _ssl_context():
+    # loading the CA bundle costs tens of ms: share one context across clients
+    global _ssl_ctx
+    if _ssl_ctx is None:
+        _ssl_ctx = httpx.create_ssl_context()
+    return _ssl_ctx
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled AsyncClient bound to the running event loop (recreated if the loop changed)."""
+    global _aclient, _aclient_loop
+    loop = asyncio.get_running_loop()
+    if _aclient is None or _aclient_loop is not loop or _aclient.is_closed:
+        _aclient = httpx.AsyncClient(
+            headers=base_headers(),
+            limits=httpx.Limits(max_connections=SUPABASE_POOL_SIZE,
+                                max_keepalive_connections=SUPABASE_POOL_SIZE),
+            verify=_ssl_context(),
+            # no transport-level retries: _arequest is the single retry layer (connect errors too)
+        )
+        _aclient_loop = loop
+    return _aclient
+
+
+async def close_async_client() -> None:
+    global _aclient
+    if _aclient is not None and not _aclient.is_closed:
+        await _aclient.aclose()
+    _aclient = None
+
+
+def _retry_delay(attempt: int, r: Optional[httpx.Response]) -> float:
+    if r is not None:
+        ra = r.headers.get("Retry-After")
+        if ra and ra.strip().isdigit():
+            return float(ra)
+    return SUPABASE_RETRY_BACKOFF * (2 ** attempt)
+
+
+async def _arequest(method: str, table: str, retry_timeouts: bool = True, **kwargs) -> httpx.Response:
+    """
+    Send with retries on RETRY_STATUSES and transport errors. With
+    `retry_timeouts=False` a read / write timeout is raised at once (the
+    caller reacts to it, e.g. the writer splits a chunk that took too long).
+    """
+    client = get_async_client()
+    url = f"{REST}/{table}"
+    for attempt in range(SUPABASE_MAX_RETRIES + 1):
+        r = None
+        try:
+            r = await client.request(method, url, **kwargs)
+            if r.status_code not in RETRY_STATUSES or attempt == SUPABASE_MAX_RETRIES:
+                UPSTREAM_RESPONSES.inc(target="supabase", status=r.status_code)
+                return r
+        except (httpx.TimeoutException, httpx.NetworkError) as e:
+            slow = isinstance(e, (httpx.ReadTimeout, httpx.WriteTimeout))
+            if attempt == SUPABASE_MAX_RETRIES or (slow and not retry_timeouts):
+                UPSTREAM_RESPONSES.inc(target="supabase", status="error")
+                raise
+        UPSTREAM_RETRIES.inc(target="supabase")
+        await asyncio.sleep(_retry_delay(attempt, r))
+    raise RuntimeError("unreachable")
+
+
+async def arest_get(table: str, params=None, headers: Optional[dict] = None,
+                    timeout: float = 20) -> httpx.Response:
+    return await _arequest("GET", table, params=params, headers=headers, timeout=timeout)
+
+
+async def arest_post(table: str, payload: Any, params=None, headers: Optional[dict] = None,
+                     timeout: float = 25, retry_timeouts: bool = True) -> httpx.Response:
+    body, h = _encode(payload)
+    if headers:
+        h.update(headers)
+    return await _arequest("POST", table, retry_timeouts=retry_timeouts,
+                           params=params, content=body, headers=h, timeout=timeout)
+
+
+def run_blocking(coro: Awaitable[T]) -> T:
+    """asyncio.run() for CLI / scripts: the loop's client is closed before the loop is."""
+    async def run():
+        try:
+            return await coro
+        finally:
+            await close_async_client()
+    return asyncio.run(run())
@@ -1,69 +1,96 @@
 # back/supabase_reader.py
-import requests
-from urllib.parse import urlparse
-from datetime import datetime
-from .config import SUPABASE_URL, SUPABASE_SERVICE_KEY, SUPABASE_TABLE
+import re
+import json
+from typing import List, Optional, Tuple
+from .config import SUPABASE_MAX_ROWS, SUPABASE_TABLE
+from .metrics import timed
+from .models import Article
+from .supabase_http import arest_get, run_blocking
 
-REST = f"{SUPABASE_URL.rstrip('/')}/rest/v1"
-HEADERS = {
-    "apikey": SUPABASE_SERVICE_KEY,
-    "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-    "Accept": "application/json",
-}
+def _to_frontend(row: dict) -> dict:
+    return Article.from_row(row).to_frontend()
 
-def _domain(link: str) -> str:
-    try:
-        return urlparse(link or "").netloc
-    except Exception:
-        return ""
+_SELECT = "id,title,link,source,published,summary,keywords,region,topic,inserted_at,updated_at"
+# Keyset order: newest first, id breaks ties; undated rows go last (like the old Python sort)
+_ORDER = "published.desc.nullslast,id.desc"
 
-def _infer_region(source: str, link: str) -> str:
-    t = f"{source or ''} {link or ''}".lower()
-    for suf, name in [
-        (".ph", "Philippines"), (".sg", "Singapore"), (".my", "Malaysia"),
-        (".id", "Indonesia"),   (".vn", "Vietnam"),   (".th", "Thailand"),
-    ]:
-        if suf in t: return name
-    return "Global"
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_ID_RE = re.compile(r"^[\w-]+$")
 
-def _to_frontend(row: dict) -> dict:
-    link = row.get("link", "")
-    source = row.get("source") or _domain(link)
-    region = row.get("region") or _infer_region(source, link)
-    topic = row.get("topic")
-    if not isinstance(topic, list):
-        topic = []
-    keywords = row.get("keywords") or ""   # ← ADDED
+def encode_cursor(row: dict) -> str:
+    """Cursor for the row *after* `row` in keyset order: 'published,id' (published may be empty)."""
+    return f"{row.get('published') or ''},{row.get('id')}"
 
-    return {
-        "Title": row.get("title", ""),
-        "Link": link,
-        "Source": source,
-        "PublishedAt": row.get("published") or "",
-        "Summary": row.get("summary", ""),
-        "Topic": topic,
-        "Region": region,
-        "Keywords": keywords,              # ← ADDED
-        "Bookmarked": False,
-        "id": link or row.get("id", ""),
-    }
+def decode_cursor(cursor: str) -> Tuple[Optional[str], str]:
+    published, sep, rid = (cursor or "").partition(",")
+    if not sep or not _ID_RE.match(rid) or (published and not _DATE_RE.match(published)):
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return (published or None), rid
 
-def get_articles() -> list:
-    params = {
-        "select": "id,title,link,source,published,summary,keywords,region,topic,inserted_at,updated_at",
-        "order": "published.desc",
-        "limit": "1000",
-    }
-    r = requests.get(f"{REST}/{SUPABASE_TABLE}", headers=HEADERS, params=params, timeout=20)
+def _keyset_params(cursor: str) -> List[Tuple[str, str]]:
+    published, rid = decode_cursor(cursor)
+    if published is None:
+        # already in the trailing undated block
+        return [("published", "is.null"), ("id", f"lt.{rid}")]
+    return [("or", f"(published.lt.{published},and(published.eq.{published},id.lt.{rid}),published.is.null)")]
+
+def _page_window(limit: int) -> Tuple[int, int]:
+    """
+    (page size, rows to request). One extra row tells us whether another page
+    exists, but PostgREST silently caps a response at SUPABASE_MAX_ROWS: when
+    the extra row doesn't fit, a full page is taken to mean "maybe more" (the
+    last page may then be followed by an empty one).
+    """
+    page = max(1, min(limit, SUPABASE_MAX_ROWS))
+    return page, min(page + 1, SUPABASE_MAX_ROWS)
+
+def _page_params(limit: int, cursor: Optional[str], region: Optional[str], topic: Optional[str],
+                 source: Optional[str], since: Optional[str], until: Optional[str]) -> List[Tuple[str, str]]:
+    params: List[Tuple[str, str]] = [
+        ("select", _SELECT),
+        ("order", _ORDER),
+        ("limit", str(_page_window(limit)[1])),
+    ]
+    if cursor:
+        params += _keyset_params(cursor)
+    if region:
+        params.append(("region", f"eq.{region}"))
+    if source:
+        params.append(("source", f"eq.{source}"))
+    if topic:
+        params.append(("topic", "cs." + json.dumps([topic])))
+    if since:
+        params.append(("published", f"gte.{since}"))
+    if until:
+        params.append(("published", f"lte.{until}"))
+    return params
+
+def _page_result(rows: list, limit: int) -> Tuple[list, Optional[str]]:
+    page, asked = _page_window(limit)
+    more = len(rows) > page or (asked == page and len(rows) == page)
+    next_cursor = encode_cursor(rows[page - 1]) if more else None
+    return [_to_frontend(x) for x in rows[:page]], next_cursor
+
+@timed("articles.read")
+async def aget_articles_page(limit: int = 1000, cursor: Optional[str] = None,
+                             region: Optional[str] = None, topic: Optional[str] = None,
+                             source: Optional[str] = None, since: Optional[str] = None,
+                             until: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """
+    One page of articles in (published desc, id desc) order, filtered server-side.
+    Returns (articles, next_cursor); next_cursor is None on the last page.
+    Pages hold at most SUPABASE_MAX_ROWS articles. Raises ValueError on a malformed cursor.
+    """
+    params = _page_params(limit, cursor, region, topic, source, since, until)
+    r = await arest_get(SUPABASE_TABLE, params=params, timeout=20)
     r.raise_for_status()
-    rows = r.json() if r.text else []
-    out = [_to_frontend(x) for x in rows]
+    return _page_result(r.json() if r.text else [], limit)
 
-    def ts(a):
-        try:
-            return datetime.fromisoformat((a.get("PublishedAt") or "").replace("Z", "+00:00"))
-        except Exception:
-            return datetime.min
+def get_articles_page(limit: int = 1000, cursor: Optional[str] = None, **filters) -> Tuple[list, Optional[str]]:
+    """Blocking wrapper (CLI / scripts) around aget_articles_page."""
+    return run_blocking(aget_articles_page(limit=limit, cursor=cursor, **filters))
 
-    out.sort(key=ts, reverse=True)
+def get_articles() -> list:
+    # Rows arrive already ordered by PostgREST, so no re-sort here.
+    out, _ = get_articles_page(limit=1000)
     return out
@@ -1,75 +1,105 @@
 #superbase_writer.py
 
-import json
-import requests
-from typing import List, Tuple, Optional
-from urllib.parse import urlparse
-from .config import SUPABASE_URL, SUPABASE_SERVICE_KEY, SUPABASE_TABLE
+import time
+import asyncio
+import httpx
+from typing import Iterable, List, Tuple, Optional
+from .config import SUPABASE_TABLE, SUPABASE_WRITE_WORKERS, SUPABASE_RETURN_MINIMAL
+from .metrics import timed
+from .supabase_http import arest_post, run_blocking
+from .write_run import ChunkTooLarge, UpsertRun, abatch, article_row
 
-REST = f"{SUPABASE_URL.rstrip('/')}/rest/v1"
-HEADERS = {
-    "apikey": SUPABASE_SERVICE_KEY,
-    "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-    "Content-Type": "application/json",
+UPSERT_HEADERS = {
     "Prefer": "return=representation,resolution=merge-duplicates",
 }
+MINIMAL_HEADERS = {
+    "Prefer": "return=minimal,resolution=merge-duplicates,count=exact",
+}
 
-def _canon(u: str) -> str:
-    try:
-        p = urlparse(u or "")
-        return f"{p.scheme}://{p.netloc}{p.path}"
-    except Exception:
-        return u or ""
+def _content_range_total(r) -> Optional[int]:
+    # PostgREST: "Content-Range: */<count>" (or "0-9/<count>") with Prefer count=exact
+    cr = r.headers.get("Content-Range") or ""
+    tail = cr.rsplit("/", 1)[-1]
+    return int(tail) if tail.isdigit() else None
 
-def _row(a: dict) -> dict:
-    pub_raw = a.get("Published") or a.get("PublishedAt") or ""
-    published = pub_raw.split("T", 1)[0] if isinstance(pub_raw, str) and "T" in pub_raw else pub_raw
 
-    # keywords fallback
-    kw = a.get("Keywords")
-    if not kw and isinstance(a.get("Topic"), list):
-        kw = ", ".join(a["Topic"]) if a["Topic"] else "Energy"
-    if not kw:
-        kw = "Energy"
+def _interpret(r, ch: List[dict], minimal: bool, elapsed: float):
+    """Classify an upsert response -> (status, rows_written, error_text, elapsed_ms)."""
+    if r.status_code == 413:
+        raise ChunkTooLarge(r.text, status=413)
+    if r.status_code >= 400:
+        return r.status_code, 0, r.text, elapsed
+    if minimal:
+        n = _content_range_total(r)
+        return r.status_code, (len(ch) if n is None else n), None, elapsed
+    data = r.json() if r.content else []   # .text would keep a decoded copy on the response
+    return r.status_code, len(data), None, elapsed
 
-    # topic as json array
-    topic = a.get("Topic") if isinstance(a.get("Topic"), list) else []
 
-    region = a.get("Region", "Global") or "Global"
+async def _apost_chunk(ch: List[dict], minimal: bool):
+    """POST one chunk; returns (status, rows_written, error_text, elapsed_ms)."""
+    t0 = time.perf_counter()
+    try:
+        r = await arest_post(
+            SUPABASE_TABLE,
+            ch,
+            params={"on_conflict": "link"},
+            headers=MINIMAL_HEADERS if minimal else UPSERT_HEADERS,
+            timeout=25,
+            retry_timeouts=False,   # a slow chunk is split at once, not re-sent whole
+        )
+    except (httpx.TimeoutException, httpx.NetworkError) as e:
+        raise ChunkTooLarge(f"{type(e).__name__}: {e}")
+    return _interpret(r, ch, minimal, (time.perf_counter() - t0) * 1000)
 
-    return {
-        "title": a.get("Title", ""),
-        "link": _canon(a.get("Link", "")),
-        "source": a.get("Source", ""),
-        "published": published,        # DATE (YYYY-MM-DD) or empty
-        "summary": a.get("Summary", ""),
-        "keywords": kw,
-        "region": region,
-        "topic": topic,                # jsonb array
-    }
 
-def write_to_supabase(items: List[dict]) -> Tuple[int, List[str], Optional[dict]]:
-    def chunks(seq, n):
-        for i in range(0, len(seq), n):
-            yield seq[i:i+n]
+@timed("supabase.write")
+async def awrite_to_supabase(items, workers: Optional[int] = None,
+                             minimal: Optional[bool] = None) -> Tuple[int, List[str], Optional[dict]]:
+    """
+    Upsert articles in chunks. `items` may be a list, an iterable or an async
+    iterable (e.g. aiter_filtered_news): each chunk is posted as soon as it
+    fills, so memory is bounded by chunk size x workers, not the corpus.
 
-    total, errs, sample = 0, [], None
-    payload_rows = [_row(i) for i in (items or [])]
+    Up to `workers` chunks are in flight at once (SUPABASE_WRITE_WORKERS), as
+    asyncio tasks. Chunk size starts at SUPABASE_CHUNK_SIZE and adapts to
+    observed latency; a 413 / timeout splits the chunk in half and retries
+    both halves. With `minimal` (SUPABASE_RETURN_MINIMAL) rows are counted
+    from the Content-Range header instead of echoing every row back.
+    """
+    workers = max(1, SUPABASE_WRITE_WORKERS if workers is None else workers)
+    minimal = SUPABASE_RETURN_MINIMAL if minimal is None else minimal
+    run = UpsertRun(SUPABASE_TABLE)
+    source = items.__aiter__() if hasattr(items, "__aiter__") else iter(items or ())
+    inflight = {}                # task -> (items batch, payload rows)
+
+    exhausted = False
+    while True:
+        while len(inflight) < workers:
+            if run.retry:
+                batch = run.retry.popleft()
+            elif not exhausted:
+                batch = await abatch(source, run.sizer.size)
+                if not batch:
+                    exhausted = True
+                    continue
+            else:
+                break
+            ch = [article_row(i) for i in batch]
+            inflight[asyncio.ensure_future(_apost_chunk(ch, minimal))] = (batch, ch)
+        if not inflight:
+            break
+        done, _ = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            batch, ch = inflight.pop(task)
+            exc = task.exception()
+            run.done(batch, ch, exc if exc is not None else task.result())
+
+    # waiting for the recorder + file I/O for the seen-link index stay off the event loop
+    return await asyncio.to_thread(run.result)
 
-    for ch in chunks(payload_rows, 200):
-        r = requests.post(
-            f"{REST}/{SUPABASE_TABLE}",
-            headers=HEADERS,
-            params={"on_conflict": "link"},
-            data=json.dumps(ch),
-            timeout=25,
-        )
-        if r.status_code >= 400:
-            errs.append(f"upsert {r.status_code}: {r.text[:300]}")
-            if sample is None:
-                sample = {"chunk": ch[:2], "error": r.text}
-            continue
-        data = r.json() if r.text else []
-        total += len(data)
 
-    return total, errs, sample
+def write_to_supabase(items: Iterable, workers: Optional[int] = None,
+                      minimal: Optional[bool] = None) -> Tuple[int, List[str], Optional[dict]]:
+    """Blocking wrapper (CLI / scripts / benchmarks) around awrite_to_supabase."""
+    return run_blocking(awrite_to_supabase(items, workers=workers, minimal=minimal))
@@ -0,0 +1,6 @@
+# back/tests/conftest.py
+import os
+import tempfile
+
+# back.config reads the environment at import: keep on-disk state out of the repo
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="engie-tests-"))
@@ -0,0 +1,52 @@
+# back/tests/test_aca_parse.py
+from back.adapters.events.aca import parse_aca_html
+
+_THREE_COL = """
+<table><tbody>
+  <tr><td>12 Nov</td><td>Grid Expo</td><td>Singapore, Singapore</td></tr>
+  <tr><td>20 Nov</td><td>Solar Summit</td><td>Kuala Lumpur, Malaysia</td></tr>
+</tbody></table>
+"""
+
+
+def _titles(html: str) -> list:
+    return [r.title for r in parse_aca_html(f"<html><body>{html}</body></html>", "Singapore")]
+
+
+def test_header_table_without_rows_falls_through_to_three_column_table():
+    empty_header = "<table><tr><th>Date</th><th>Conference</th><th>Venue</th></tr></table>"
+    assert _titles(empty_header + _THREE_COL) == ["Grid Expo", "Solar Summit"]
+
+
+def test_header_table_wins_over_earlier_three_column_table():
+    header = ("<table><tr><th>Date</th><th>Conference</th><th>Venue</th></tr>"
+              "<tr><td>1 Dec</td><td>LNG Forum</td><td>Manila, Philippines</td></tr></table>")
+    assert _titles(_THREE_COL + header) == ["LNG Forum"]
+
+
+def test_nested_tables_match_the_outer_table_first():
+    outer = ("<table><tbody>"
+             "<tr><td>3 Dec</td><td>Outer A</td><td>Jakarta, Indonesia</td></tr>"
+             "<tr><td>4 Dec</td><td>Outer B</td><td>Hanoi, Vietnam</td></tr>"
+             f"<tr><td colspan='3'>{_THREE_COL}</td></tr>"
+             "</tbody></table>")
+    assert _titles(outer)[:2] == ["Outer A", "Outer B"]
+
+
+def test_rows_carry_canonical_region():
+    rows = parse_aca_html(f"<html><body>{_THREE_COL}</body></html>", "Singapore")
+    assert [(r.city, r.region) for r in rows] == [("Singapore", "Singapore"), ("Kuala Lumpur", "Malaysia")]
+
+
+def test_static_and_rendered_rows_share_region_normalization():
+    from back.adapters.events.aca_playwright import _rows_to_events
+
+    data = {"heading": "Energy Conference in Vietnam 2026",
+            "rows": [["12 Nov", "Grid Expo", "/e/1", "Hanoi, Viet Nam"],
+                     ["20 Nov", "Solar Summit", "/e/2", "Singapore"],
+                     ["21 Nov", "Wind Week", "/e/3", ""]]}
+    rendered = _rows_to_events(data, "Vietnam", "https://example.com")
+    table = "".join(f"<tr><td>{d}</td><td>{t}</td><td>{v}</td></tr>" for d, t, _, v in data["rows"])
+    static = parse_aca_html(f"<html><body><table><tbody>{table}</tbody></table></body></html>", "Vietnam")
+    assert [(r.city, r.region) for r in rendered] == [(r.city, r.region) for r in static] == [
+        ("Hanoi", "Vietnam"), ("Singapore", "Singapore"), (None, "Vietnam")]
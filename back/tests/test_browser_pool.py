@@ -0,0 +1,32 @@
+# back/tests/test_browser_pool.py
+import asyncio
+import threading
+
+from back.adapters.events import browser_pool
+
+
+def test_pool_of_a_replaced_loop_is_closed_on_that_loop(monkeypatch):
+    closed_on = []
+
+    async def close(self):
+        closed_on.append(asyncio.get_running_loop())
+
+    monkeypatch.setattr(browser_pool.BrowserPool, "close", close)
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        old = asyncio.run_coroutine_threadsafe(_get_pool(), old_loop).result(5)
+        new = asyncio.run(_get_pool())
+        assert new is not old
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), old_loop).result(5)   # the close was queued first
+        assert closed_on == [old_loop]
+    finally:
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(5)
+        old_loop.close()
+        asyncio.run(browser_pool.close_browser_pool())
+
+
+async def _get_pool():
+    return browser_pool.get_browser_pool()
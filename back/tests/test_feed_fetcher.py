@@ -0,0 +1,25 @@
+# back/tests/test_feed_fetcher.py
+import asyncio
+import time
+
+import httpx
+
+from back.adapters import feed_fetcher
+
+
+def test_feed_timeout_covers_the_parse(monkeypatch):
+    def slow_finish(res, *args):
+        time.sleep(0.3)
+        res.entries = ["late"]
+        return res
+
+    monkeypatch.setattr(feed_fetcher, "_finish", slow_finish)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, content=b"<rss/>")))
+
+    async def fetch():
+        async with client:
+            return await feed_fetcher._afetch_one(client, 0, "http://mock/feed.xml", "mock", 0.1, None)
+
+    res = asyncio.run(fetch())
+    assert res.error == "TimeoutError"
+    assert res.entries == [] and res.fetch_ms < 100
@@ -0,0 +1,101 @@
+# back/tests/test_pagination.py
+import asyncio
+import random
+import re
+
+import httpx
+import pytest
+
+from back import supabase_reader
+from back.local_store import LocalStore
+from back.supabase_reader import decode_cursor, encode_cursor
+
+
+def _rows(n: int, seed: int = 7) -> list:
+    # many ties on published (same day) and some undated rows, like real feeds
+    rnd = random.Random(seed)
+    days = [f"2026-10-{d:02d}" for d in range(1, 6)] + [None]
+    return [{"id": i + 1, "link": f"https://ex.com/{i}", "title": f"t{i}", "source": "ex.com",
+             "published": rnd.choice(days), "summary": "", "keywords": "", "region": "Global", "topic": []}
+            for i in range(n)]
+
+
+def _keyset_order(rows: list) -> list:
+    dated = sorted((r for r in rows if r["published"]), key=lambda r: (r["published"], r["id"]), reverse=True)
+    undated = sorted((r for r in rows if not r["published"]), key=lambda r: r["id"], reverse=True)
+    return dated + undated
+
+
+def _walk(page_fn, limit: int) -> list:
+    links, cursor = [], None
+    while True:
+        page, cursor = page_fn(limit, cursor)
+        links += [a["Link"] for a in page]
+        if not cursor:
+            return links
+
+
+@pytest.mark.parametrize("row", [
+    {"published": "2026-10-03", "id": 42},
+    {"published": None, "id": 7},
+    {"published": "", "id": "abc-1"},
+])
+def test_cursor_round_trip(row):
+    published, rid = decode_cursor(encode_cursor(row))
+    assert published == (row["published"] or None)
+    assert rid == str(row["id"])
+
+
+@pytest.mark.parametrize("bad", ["", "2026-10-03", "nope,1", "2026-10-03,1;drop", "2026/10/03,1"])
+def test_cursor_rejects_malformed(bad):
+    with pytest.raises(ValueError):
+        decode_cursor(bad)
+
+
+@pytest.mark.parametrize("limit", [1, 3, 10, 37, 1000])
+def test_local_paging_has_no_duplicates_or_gaps(tmp_path, limit):
+    rows = _rows(250)
+    store = LocalStore(str(tmp_path / "news.sqlite3"))
+    store.upsert_news([{k: v for k, v in r.items() if k != "id"} for r in rows])
+    expected = [a["Link"] for a in store.news_page(10_000)[0]]
+
+    links = _walk(lambda n, c: store.news_page(n, c), limit)
+    assert links == expected
+    assert len(set(links)) == len(rows)
+
+
+class _CappedPostgrest:
+    """In-memory /news endpoint with PostgREST's keyset filters and a db-max-rows cap."""
+
+    _OR = re.compile(r"^\(published\.lt\.([\d-]+),and\(published\.eq\.\1,id\.lt\.(\d+)\),published\.is\.null\)$")
+
+    def __init__(self, rows: list, max_rows: int):
+        self.rows, self.max_rows = _keyset_order(rows), max_rows
+
+    async def __call__(self, table, params=None, headers=None, timeout=20):
+        p = dict(params)
+        out = self.rows
+        if "or" in p:
+            published, rid = self._OR.match(p["or"]).groups()
+            out = [r for r in out if not r["published"] or r["published"] < published
+                   or (r["published"] == published and r["id"] < int(rid))]
+        elif p.get("published") == "is.null":
+            rid = int(p["id"].split(".", 1)[1])
+            out = [r for r in out if not r["published"] and r["id"] < rid]
+        out = out[:min(int(p["limit"]), self.max_rows)]
+        return httpx.Response(200, json=out, request=httpx.Request("GET", f"http://mock/{table}"))
+
+
+@pytest.mark.parametrize("n_rows,limit", [(2500, 1000), (2000, 1000), (999, 1000), (1000, 1000), (1200, 5000), (730, 100)])
+def test_supabase_paging_under_max_rows_cap(monkeypatch, n_rows, limit):
+    rows = _rows(n_rows)
+    monkeypatch.setattr(supabase_reader, "arest_get", _CappedPostgrest(rows, max_rows=1000))
+    monkeypatch.setattr(supabase_reader, "SUPABASE_MAX_ROWS", 1000)
+
+    def page(n, cursor):
+        out, nxt = asyncio.run(supabase_reader.aget_articles_page(limit=n, cursor=cursor))
+        assert len(out) <= 1000
+        return out, nxt
+
+    links = _walk(page, limit)
+    assert links == [r["link"] for r in _keyset_order(rows)]
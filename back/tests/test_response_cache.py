@@ -0,0 +1,111 @@
+# back/tests/test_response_cache.py
+import asyncio
+
+import pytest
+
+from back import response_cache
+from back.response_cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(response_cache.time, "monotonic", c)
+    return c
+
+
+def test_concurrent_misses_share_one_load(clock):
+    cache = ResponseCache("t", ttl=10)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return {"n": len(calls)}
+
+    async def main():
+        return await asyncio.gather(*(cache.aget("k", load) for _ in range(5)))
+
+    assert {body for body, _ in asyncio.run(main())} == {b'{"n":1}'}
+    assert len(calls) == 1
+
+
+def test_stale_entry_is_served_while_refresh_fails(clock):
+    cache = ResponseCache("t", ttl=10, stale=60)
+
+    async def main():
+        assert (await cache.aget("k", _const("old")))[0] == b'"old"'
+        clock.now += 20                      # stale: served as is, refreshed in the background
+        assert (await cache.aget("k", _boom))[0] == b'"old"'
+        await asyncio.sleep(0)               # let the refresh fail
+        assert not cache._atasks
+        return await cache.aget("k", _boom)  # still within the stale window
+
+    assert asyncio.run(main())[0] == b'"old"'
+
+
+def test_miss_joining_a_failed_refresh_raises(clock):
+    cache = ResponseCache("t", ttl=10, stale=60)
+    release = None
+
+    async def slow_boom():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        await cache.aget("k", _const("old"))
+        clock.now += 20
+        await cache.aget("k", slow_boom)     # starts the background refresh
+        clock.now += 100                     # entry now too old: the next call is a miss
+        miss = asyncio.ensure_future(cache.aget("k", _const("new")))
+        await asyncio.sleep(0)
+        release.set()
+        return await miss
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        asyncio.run(main())
+
+
+def test_invalidate_forgets_in_flight_loads(clock):
+    cache = ResponseCache("t", ttl=10)
+    release = None
+
+    async def old():
+        await release.wait()
+        return "old"
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.ensure_future(cache.aget("k", old))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        second = await cache.aget("k", _const("new"))   # doesn't join the pre-invalidate load
+        release.set()
+        assert (await first)[0] == b'"old"'             # its waiter still gets an answer
+        await asyncio.sleep(0)
+        return second, await cache.aget("k", _const("other"))
+
+    second, cached = asyncio.run(main())
+    assert second[0] == b'"new"'
+    assert cached[0] == b'"new"'                         # the old load didn't overwrite it
+
+
+def _const(value):
+    async def load():
+        return value
+    return load
+
+
+async def _boom():
+    raise RuntimeError("upstream down")
@@ -0,0 +1,54 @@
+# back/tests/test_scheduler.py
+import asyncio
+
+from back.jobs import JobRegistry
+from back.scheduler import RefreshScheduler
+
+
+def _scheduler():
+    s = RefreshScheduler(JobRegistry())
+    running, log = [], []
+
+    def run(tag):
+        async def fn():
+            running.append(tag)
+            assert len(running) == 1, f"runs overlap: {running}"
+            await asyncio.sleep(0.01)
+            running.remove(tag)
+            log.append(tag)
+            return tag
+        return fn
+
+    s.register("news", run("timer"), params={"full": False})
+    return s, run, log
+
+
+def test_triggers_with_equal_params_join_one_run():
+    async def main():
+        s, run, log = _scheduler()
+        first, joined0 = s.trigger("news", source="schedule")
+        again, joined1 = s.trigger("news", run("api"), params={"full": False})
+        await s.jobs.wait(first)
+        return first, again, joined0, joined1, log, s.history("news")
+
+    first, again, joined0, joined1, log, history = asyncio.run(main())
+    assert again is first and (joined0, joined1) == (False, True)
+    assert log == ["timer"]
+    assert history[0]["joined"] == 1 and history[0]["trigger"] == "schedule"
+
+
+def test_different_params_queue_behind_the_running_one():
+    async def main():
+        s, run, log = _scheduler()
+        incr, _ = s.trigger("news", source="schedule")
+        full, joined = s.trigger("news", run("full"), params={"full": True})
+        full2, joined2 = s.trigger("news", run("full-again"), params={"full": True})
+        queued = s.status()["news"]["queued_jobs"]
+        await s.jobs.wait(full)
+        return incr, full, full2, joined, joined2, queued, log
+
+    incr, full, full2, joined, joined2, queued, log = asyncio.run(main())
+    assert full is not incr and not joined
+    assert full2 is full and joined2            # joins the queued run with equal params
+    assert queued == [full.id]
+    assert log == ["timer", "full"]             # in order, never overlapping
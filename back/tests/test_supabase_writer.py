@@ -0,0 +1,65 @@
+# back/tests/test_supabase_writer.py
+import asyncio
+
+import httpcore
+import httpx
+
+from back import supabase_http, supabase_writer
+from back.models import Article
+
+
+def _articles(n: int) -> list:
+    return [Article(title=f"t{i}", link=f"https://ex.com/{i}", source="ex.com") for i in range(n)]
+
+
+def test_timed_out_chunk_is_split_without_retrying(monkeypatch):
+    sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        n = request.content.count(b'"link"')
+        sizes.append(n)
+        if n > 2:
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(201, json=[{}] * n)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(supabase_http, "get_async_client", lambda: client)
+    monkeypatch.setattr(supabase_http, "SUPABASE_GZIP_REQUESTS", False)
+    monkeypatch.setattr(supabase_http, "REST", "http://mock/rest/v1")
+
+    async def sleep(_):   # a retry would back off; none is expected
+        raise AssertionError("timed-out upsert was retried")
+
+    monkeypatch.setattr(supabase_http.asyncio, "sleep", sleep)
+    written, errs, _ = asyncio.run(supabase_writer.awrite_to_supabase(_articles(8), workers=1))
+    assert errs == [] and written == 8
+    assert sizes[0] == 8 and sizes.count(8) == 1   # first timeout -> split, no re-send of the whole chunk
+
+
+def test_unreachable_host_is_tried_once_per_retry(monkeypatch):
+    from httpcore._backends.auto import AutoBackend
+
+    connects = []
+
+    async def connect_tcp(self, host, port, **kwargs):
+        connects.append((host, port))
+        raise httpcore.ConnectError("refused")
+
+    async def sleep(_):
+        pass
+
+    monkeypatch.setattr(AutoBackend, "connect_tcp", connect_tcp)
+    monkeypatch.setattr(supabase_http, "REST", "http://mock/rest/v1")
+    monkeypatch.setattr(supabase_http, "SUPABASE_MAX_RETRIES", 2)
+    monkeypatch.setattr(supabase_http.asyncio, "sleep", sleep)
+
+    async def get():
+        try:
+            await supabase_http.arest_get("news")
+        except httpx.ConnectError:
+            return "refused"
+        finally:
+            await supabase_http.close_async_client()
+
+    assert asyncio.run(get()) == "refused"
+    assert len(connects) == 3   # 1 try + SUPABASE_MAX_RETRIES, no transport retries underneath
@@ -0,0 +1,149 @@
+# back/write_run.py
+"""
+Backend-independent side of an article write, shared by supabase_writer
+and local_store:
+  article_row  Article (or legacy dict) -> payload row
+  abatch       next chunk from an iterator or async iterator
+  ChunkSizer   adaptive chunk size, ChunkTooLarge asks for a split
+  UpsertRun    per-write bookkeeping, and recording stored chunks in the
+               seen-link store, near-dup index and search index
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Optional, Tuple
+
+from .config import (
+    SUPABASE_CHUNK_SIZE, SUPABASE_CHUNK_MIN, SUPABASE_CHUNK_MAX, SUPABASE_CHUNK_TARGET_MS,
+    NEAR_DUP_ENABLED, SEARCH_ENABLED,
+)
+from .metrics import ROWS_WRITTEN
+from .models import Article
+from .near_dupes import get_near_dup_index
+from .search_index import get_search_index
+from .seen_store import get_seen_store
+
+__all__ = ["article_row", "abatch", "ChunkSizer", "ChunkTooLarge", "UpsertRun"]
+
+
+def article_row(a) -> dict:
+    # Articles serialize straight to the payload; legacy dicts are coerced first
+    return Article.from_item(a).to_row()
+
+
+async def abatch(source, n: int) -> List[dict]:
+    """Next chunk of up to `n` items from an iterator or async iterator ([] when exhausted)."""
+    if hasattr(source, "__anext__"):
+        batch = []
+        async for it in source:
+            batch.append(it)
+            if len(batch) >= n:
+                break
+        return batch
+    return list(islice(source, n))
+
+
+class ChunkSizer:
+    """
+    Adaptive chunk size: steer towards SUPABASE_CHUNK_TARGET_MS per request
+    (at most x2 / ÷2 per observation), and halve on 413 / timeouts.
+    """
+
+    def __init__(self, size: int = SUPABASE_CHUNK_SIZE, lo: int = SUPABASE_CHUNK_MIN,
+                 hi: int = SUPABASE_CHUNK_MAX, target_ms: float = SUPABASE_CHUNK_TARGET_MS):
+        self.lo, self.hi, self.target_ms = max(1, lo), max(lo, hi), target_ms
+        self.size = self._clamp(size)
+
+    def _clamp(self, n: float) -> int:
+        return int(min(self.hi, max(self.lo, n)))
+
+    def observe(self, rows: int, elapsed_ms: float) -> None:
+        ideal = rows * self.target_ms / max(elapsed_ms, 1.0)
+        self.size = self._clamp(min(self.size * 2, max(self.size / 2, ideal)))
+
+    def shrink(self, failed_rows: int, too_large: bool) -> None:
+        if too_large:
+            # the server rejected this payload size: never grow back past it
+            self.hi = max(self.lo, failed_rows // 2)
+        self.size = self._clamp(min(self.size, failed_rows) / 2)
+
+
+class ChunkTooLarge(Exception):
+    """Chunk rejected as too large (413) or timed out: retry it split in half."""
+
+    def __init__(self, msg: str, status: Optional[int] = None):
+        super().__init__(msg)
+        self.status = status
+
+
+class UpsertRun:
+    """
+    Bookkeeping of one write: totals, errors, adaptive chunk size, retries.
+
+    Recording a stored chunk (seen-link store, near-dup index, search index)
+    is blocking CPU / SQLite work, so it runs on one background thread, in
+    chunk order, while the next chunks are on the wire; result() waits for
+    it. The event loop never runs it inline.
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self.total, self.errs, self.sample = 0, [], None
+        self.store = get_seen_store()
+        self.dupes = get_near_dup_index() if NEAR_DUP_ENABLED else None
+        self.search = get_search_index() if SEARCH_ENABLED else None
+        self.sizer = ChunkSizer()
+        self.retry: deque = deque()   # split halves waiting to be re-sent
+        self._recorder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="write-record")
+        self._recorded: list = []     # futures of _record calls
+
+    def done(self, batch: List[dict], ch: List[dict], outcome) -> None:
+        """
+        Record one chunk. `outcome` is the backend's
+        (status, rows_written, error_text, elapsed_ms) tuple or the exception
+        it raised; ChunkTooLarge splits the batch into run.retry.
+        """
+        if isinstance(outcome, ChunkTooLarge):
+            if len(batch) > 1:
+                self.sizer.shrink(len(batch), too_large=outcome.status == 413)
+                mid = len(batch) // 2
+                self.retry.append(batch[:mid])
+                self.retry.append(batch[mid:])
+                return
+            status, n, err, elapsed = outcome.status, 0, str(outcome), 0.0
+        elif isinstance(outcome, BaseException):
+            status, n, err, elapsed = None, 0, f"{type(outcome).__name__}: {outcome}", 0.0
+        else:
+            status, n, err, elapsed = outcome
+        if err is not None:
+            self.errs.append(f"upsert {status}: {err[:300]}" if status else f"upsert failed: {err[:300]}")
+            if self.sample is None:
+                self.sample = {"chunk": ch[:2], "error": err}
+            return
+        self.sizer.observe(len(batch), elapsed)
+        self.total += n
+        ROWS_WRITTEN.inc(n, table=self.table)
+        self._recorded.append(self._recorder.submit(self._record, batch, ch))
+
+    def _record(self, batch: List[dict], ch: List[dict]) -> None:
+        # remember what is stored so incremental refreshes can skip it
+        self.store.mark_written(batch)
+        if self.dupes is not None:
+            self.dupes.mark_written(batch)   # stored titles become canonical for near-dup checks
+        if self.search is not None:
+            try:
+                self.search.add(ch)          # same payload the backend stored -> GET /search
+            except Exception as e:
+                print(f"[SEARCH] Could not index chunk: {e}")
+
+    def result(self) -> Tuple[int, List[str], Optional[dict]]:
+        """Wait for the recorded chunks, then persist the stores (blocking)."""
+        self._recorder.shutdown(wait=True)
+        for f in self._recorded:
+            f.result()                       # re-raise a failed mark_written here
+        self.store.save()
+        if self.dupes is not None:
+            self.dupes.save()
+        return self.total, self.errs, self.sample